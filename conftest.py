@@ -0,0 +1 @@
+"""Make the repository root importable so tests can import liquidityBot."""
@@ -11,7 +11,9 @@ transaction parameters.
 # requires-python = ">=3.12"
 # dependencies = [
 #     "hive-nectar",
+#     "ijson",
 #     "nectarengine",
+#     "orjson",
 # ]
 #
 # [tool.uv.sources]
@@ -21,14 +23,45 @@ transaction parameters.
 
 # Standard library imports
 import argparse
+import functools
+import io
 import json
 import logging
 import os
-import sys
+import tempfile
 import time
-from decimal import ROUND_DOWN, Decimal
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from decimal import ROUND_DOWN, Decimal, InvalidOperation
+from logging.handlers import MemoryHandler
+from operator import itemgetter
+from pathlib import Path
 
 # Third-party imports
+try:
+    # orjson parses the HE log payloads several times faster than stdlib json
+    # and is a drop-in replacement for loads(); fall back when absent.
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+try:
+    # Optional: stream-parse outsized HE log payloads instead of
+    # materializing the full tree just to find one event.
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    # nectarengine's RPC layer routes every request through one
+    # module-shared session; these hooks (where present) let the pooled
+    # session below replace it.
+    from nectarengine.rpc import set_session_instance, shared_session_instance
+except ImportError:
+    set_session_instance = None
+    shared_session_instance = None
+
+import requests
 from nectar import Hive
 from nectar.nodelist import NodeList
 
@@ -44,6 +77,7 @@ from nectarengine.pool import LiquidityPool
 from nectarengine.poolobject import Pool
 from nectarengine.tokenobject import Token
 from nectarengine.wallet import Wallet
+from requests.adapters import HTTPAdapter
 
 # --- Script Configuration ---
 HIVE_ENGINE_TX_CONFIRM_DELAY_SECONDS = int(
@@ -55,71 +89,399 @@ MAX_TX_INFO_RETRIES = int(
 TX_INFO_RETRY_DELAY_SECONDS = int(
     os.getenv("TX_INFO_RETRY_DELAY_SECONDS", "10")
 )  # Delay between retries
+TX_INFO_BACKOFF_CAP_SECONDS = int(
+    os.getenv("LIQUIDITYBOT_BACKOFF_CAP", "60")
+)  # Upper bound for the exponential retry backoff
+BLOCK_POLL_INTERVAL_SECONDS = 1.0  # Block watcher cadence; see --block-poll-ms
 CONFIG_FILE_PATH = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "config.json"
 )
+CACHE_DIR = Path(
+    os.getenv("LIQUIDITYBOT_CACHE_DIR", os.path.expanduser("~/.cache/liquiditybot"))
+)
+TOKEN_INFO_CACHE_FILE = CACHE_DIR / "token_info.json"
 
 
 # Default operational parameters (can be overridden by command-line args)
 DEFAULT_PRICE_THRESHOLD = Decimal("0.047")
 DEFAULT_AMOUNT_TO_TRADE = Decimal("50")
 
+# Shared zero sentinel; Decimal("0") pays the string-parsing constructor on
+# every comparison otherwise.
+ZERO = Decimal(0)
+
 # Hive Engine API and Hive nodes
 HE_API_URL = "https://enginerpc.com/"
-nodelist = NodeList()
-HIVE_NODES = nodelist.get_hive_nodes()
+HIVE_NODES_CACHE_FILE = CACHE_DIR / "hive_nodes.json"
+HIVE_NODES_CACHE_TTL_SECONDS = 3600
+
+# One pooled keep-alive session for all HE RPC calls; avoids a fresh TCP/TLS
+# handshake per request.
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_HE_API_CLIENT = None
+
+
+def _install_pooled_session() -> None:
+    """
+    Install the pooled session as nectarengine's module-shared RPC session.
+
+    Only the requests-based nectarengine RPC can use it: httpx-based releases
+    expose the same set_session_instance hook but their transport calls
+    post(..., content=...), which a requests.Session rejects, so the default
+    session's type is checked first. Versions without the hooks, or with an
+    httpx default session, keep their own (still shared, keep-alive) session.
+    """
+    if set_session_instance is None or shared_session_instance is None:
+        return
+    try:
+        default_session = shared_session_instance()
+    except Exception:
+        return
+    if isinstance(default_session, requests.Session):
+        set_session_instance(_HTTP_SESSION)
+
+
+_install_pooled_session()
+
+# Shared executor for overlapping independent RPCs. Threads are created
+# lazily, and max_workers doubles as the concurrency cap so parallel reads
+# stay within the HE API's comfort zone.
+_RPC_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="he-rpc")
+
+
+def get_he_api_client() -> Api:
+    """
+    Return the shared nectarengine Api client for the HE RPC endpoint.
+
+    A single client is reused everywhere; its requests go through the RPC
+    layer's shared session, which is the pooled keep-alive session injected
+    at import time where the installed nectarengine supports it.
+    """
+    global _HE_API_CLIENT
+    if _HE_API_CLIENT is None:
+        _HE_API_CLIENT = Api(url=HE_API_URL)
+    return _HE_API_CLIENT
+
 
 # --- Logging Configuration ---
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+# The formatter only uses asctime/levelname/message, so skip the thread and
+# process fields LogRecord would otherwise populate on every call.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+# Likewise skip the sys._getframe walk findCaller does per record to locate
+# the calling file/line; nothing here formats %(filename)s/%(lineno)d/
+# %(funcName)s. Clearing _srcfile makes Logger.findCaller short-circuit.
+logging._srcfile = None
+
+# Records are buffered in memory and drained in one burst instead of paying a
+# handler lock + write syscall per log line. ERROR-and-above (and a full
+# buffer) flush immediately, so tracebacks still come out right away on the
+# failure path; logging.shutdown() in the __main__ block performs the final
+# drain for normal runs.
+_LOG_STREAM_HANDLER = logging.StreamHandler()
+_LOG_STREAM_HANDLER.setFormatter(
+    logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+)
+_LOG_BUFFER_HANDLER = MemoryHandler(
+    2048,
+    flushLevel=logging.ERROR,
+    target=_LOG_STREAM_HANDLER,
+    flushOnClose=True,
 )
+_ROOT_LOGGER = logging.getLogger()
+_ROOT_LOGGER.setLevel(logging.INFO)
+_ROOT_LOGGER.addHandler(_LOG_BUFFER_HANDLER)
+logger = logging.getLogger(__name__)
 
 # --- Global Variables for Credentials (loaded from config.json) ---
 HIVE_ACCOUNT_NAME = None
 HIVE_ACTIVE_KEY = None
 
 
-def load_credentials():
-    """Load Hive account credentials from the config.json file."""
-    global HIVE_ACCOUNT_NAME, HIVE_ACTIVE_KEY
+def load_config() -> dict | None:
+    """Load and parse config.json, returning the config dict or None on error."""
     try:
         with open(CONFIG_FILE_PATH) as f:
-            config_data = json.load(f)
+            return json.load(f)
+    except FileNotFoundError:
+        logger.error("Configuration file %s not found.", CONFIG_FILE_PATH)
+        return None
+    except json.JSONDecodeError:
+        logger.error("Could not decode JSON from %s.", CONFIG_FILE_PATH)
+        return None
+    except Exception as e:
+        logger.error("Error loading credentials: %s", e)
+        return None
 
-        hive_config = config_data.get("hive")
-        if not hive_config:
-            logging.error(f"'hive' section not found in {CONFIG_FILE_PATH}")
-            return False
 
-        HIVE_ACCOUNT_NAME = hive_config.get("accountName")
-        HIVE_ACTIVE_KEY = hive_config.get("activeKey")
+def load_credentials(config_data: dict) -> bool:
+    """
+    Populate the credential globals from a parsed config dict.
 
-        if not HIVE_ACCOUNT_NAME:
-            logging.error(
-                f"'accountName' not found in 'hive' section of {CONFIG_FILE_PATH}"
-            )
-            return False
+    Only the account name is mandatory here; the active key is validated
+    separately by require_active_key, since dry runs never broadcast.
+    """
+    global HIVE_ACCOUNT_NAME, HIVE_ACTIVE_KEY
+    hive_config = config_data.get("hive")
+    if not hive_config:
+        logger.error("'hive' section not found in %s", CONFIG_FILE_PATH)
+        return False
 
-        if not HIVE_ACTIVE_KEY:
-            logging.critical(
-                f"'activeKey' not found or is empty in 'hive' section of {CONFIG_FILE_PATH}."
-            )
-            logging.critical(
-                "A valid Hive ACTIVE KEY is REQUIRED for selling tokens and liquidity pool operations."
-            )
-            logging.critical("Please update config.json with the correct active key.")
-            return False
+    HIVE_ACCOUNT_NAME = hive_config.get("accountName")
+    HIVE_ACTIVE_KEY = hive_config.get("activeKey")
 
-        return True
-    except FileNotFoundError:
-        logging.error(f"Configuration file {CONFIG_FILE_PATH} not found.")
+    if not HIVE_ACCOUNT_NAME:
+        logger.error(
+            "'accountName' not found in 'hive' section of %s", CONFIG_FILE_PATH
+        )
         return False
-    except json.JSONDecodeError:
-        logging.error(f"Could not decode JSON from {CONFIG_FILE_PATH}.")
+
+    return True
+
+
+def require_active_key(config_data: dict) -> bool:
+    """Validate that a non-empty activeKey is present in the 'hive' section."""
+    hive_config = (config_data or {}).get("hive") or {}
+    if not hive_config.get("activeKey"):
+        logger.critical(
+            "'activeKey' not found or is empty in 'hive' section of %s.",
+            CONFIG_FILE_PATH,
+        )
+        logger.critical(
+            "A valid Hive ACTIVE KEY is REQUIRED for selling tokens and liquidity pool operations."
+        )
+        logger.critical("Please update config.json with the correct active key.")
         return False
+    return True
+
+
+def _atomic_write_json(path: Path, data):
+    """Write JSON-serializable data to path atomically (temp file + os.replace)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        # Best effort cleanup; caller decides whether a failed write matters.
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_cached_token_info(symbol: str) -> dict | None:
+    """
+    Return cached token info (e.g. precision) for a symbol, or None on miss.
+
+    Token metadata like precision is immutable on Hive Engine, so a hit here
+    lets us skip a network round-trip at startup.
+    """
+    try:
+        with open(TOKEN_INFO_CACHE_FILE) as f:
+            cache = json.load(f)
+        return cache.get(symbol)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
     except Exception as e:
-        logging.error(f"Error loading credentials: {e}")
-        return False
+        logger.warning("Could not read token info cache: %s", e)
+        return None
+
+
+def save_cached_token_info(symbol: str, info: dict):
+    """Persist token info for a symbol to the on-disk cache (best effort)."""
+    try:
+        try:
+            with open(TOKEN_INFO_CACHE_FILE) as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            cache = {}
+        cache[symbol] = info
+        _atomic_write_json(TOKEN_INFO_CACHE_FILE, cache)
+    except Exception as e:
+        logger.warning("Could not write token info cache for %s: %s", symbol, e)
+
+
+def get_hive_nodes_cached() -> list:
+    """
+    Return the list of Hive nodes, using a disk cache with a short TTL.
+
+    Fetching the node list at import time made even --help pay for a network
+    call. Set LIQUIDITYBOT_FORCE_REFRESH_NODES to bypass the cache.
+    """
+    if not os.getenv("LIQUIDITYBOT_FORCE_REFRESH_NODES"):
+        try:
+            cache_age = time.time() - HIVE_NODES_CACHE_FILE.stat().st_mtime
+            if cache_age < HIVE_NODES_CACHE_TTL_SECONDS:
+                with open(HIVE_NODES_CACHE_FILE) as f:
+                    nodes = json.load(f)
+                if nodes:
+                    return nodes
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        except Exception as e:
+            logger.warning("Could not read hive nodes cache: %s", e)
+
+    nodelist = NodeList()
+    nodes = nodelist.get_hive_nodes()
+    try:
+        _atomic_write_json(HIVE_NODES_CACHE_FILE, nodes)
+    except Exception as e:
+        logger.warning("Could not write hive nodes cache: %s", e)
+    return nodes
+
+
+def fetch_tokens_info(api: Api, symbols: list[str]) -> dict:
+    """
+    Fetch info for several tokens with a single Hive Engine 'find' query.
+
+    Returns a dict mapping symbol -> token info dict. Symbols the API did not
+    return are simply absent from the result.
+    """
+    rows = api.find("tokens", "tokens", query={"symbol": {"$in": symbols}})
+    # Some API versions unwrap a single-row result into the bare row dict,
+    # as with the find_one call sites elsewhere in this file.
+    if isinstance(rows, dict):
+        rows = [rows]
+    return {row["symbol"]: row for row in rows or [] if "symbol" in row}
+
+
+def resolve_token_precisions(api: Api, symbols: list[str]) -> dict[str, int]:
+    """
+    Resolve token precisions for symbols via the disk cache, then the API.
+
+    Cache misses are fetched with a single batched query, falling back to a
+    per-symbol Token lookup for anything the batch did not return. Raises
+    ValueError if a precision cannot be determined for any symbol.
+    """
+    token_infos = {symbol: load_cached_token_info(symbol) for symbol in symbols}
+    missing_symbols = [symbol for symbol in symbols if token_infos[symbol] is None]
+    if missing_symbols:
+        try:
+            fetched_infos = fetch_tokens_info(api, missing_symbols)
+        except Exception as e:
+            logger.warning(
+                "Batched token info fetch failed for %s: %s. Falling back to per-symbol lookups.",
+                missing_symbols,
+                e,
+            )
+            fetched_infos = {}
+        for symbol in missing_symbols:
+            info = fetched_infos.get(symbol)
+            if info is None:
+                info = Token(symbol, api=api).get_info()
+            if not info or info.get("precision") is None:
+                raise ValueError(
+                    f"Precision not found for token '{symbol}' after fetching info."
+                )
+            save_cached_token_info(symbol, {"precision": int(info["precision"])})
+            token_infos[symbol] = info
+
+    token_precisions = {}
+    for symbol in symbols:
+        info = token_infos[symbol]
+        if not info or info.get("precision") is None:
+            raise ValueError(f"Precision not found for token '{symbol}'.")
+        token_precisions[symbol] = int(info["precision"])
+    return token_precisions
+
+
+# Wallet construction performs a balance fetch, so reuse one instance per
+# account instead of rebuilding it for every balance check.
+_WALLET_CACHE: dict[str, Wallet] = {}
+
+
+def get_wallet(account_name: str, he_api_client: Api) -> Wallet:
+    """
+    Return a cached Wallet for the account, constructing it on first use.
+
+    Construction fetches the account's balances, so callers that need
+    up-to-date figures after a broadcast should call wallet.refresh()
+    themselves rather than building a new instance.
+    """
+    wallet = _WALLET_CACHE.get(account_name)
+    if wallet is None:
+        wallet = Wallet(account_name, api=he_api_client)
+        _WALLET_CACHE[account_name] = wallet
+    return wallet
+
+
+def _fetch_wallet_token_data(account_name: str, symbol: str, he_api_client: Api):
+    """Fetch one token's wallet entry for an account (parallel startup worker)."""
+    return get_wallet(account_name, he_api_client).get_token(symbol)
+
+
+# One atomic view of the market taken at startup: the pool price, the wallet
+# balance of the target asset, and the HE block they were observed at. The
+# whole swap decision is based on this snapshot so the "price moved between
+# queries" class of bug cannot appear.
+SwapSnapshot = namedtuple("SwapSnapshot", "price balance block")
+
+
+# Pool prices cannot change within a Hive Engine block, so cache them keyed
+# by (pair, block number); repeat reads within a block are then free.
+_PRICE_CACHE: dict[tuple[str, int], Decimal] = {}
+_PRICE_CACHE_MAX_ENTRIES = 64
+
+
+def reset_price_cache():
+    """Clear the block-keyed pool price cache (e.g. after a suspected reorg)."""
+    _PRICE_CACHE.clear()
+
+
+# Full pool documents fetched for the deposit-ratio math, keyed by pair with
+# a short TTL. A swap changes the reserves, so entries are dropped after one.
+_POOL_DATA_CACHE: dict[str, tuple[float, dict]] = {}
+_POOL_DATA_TTL_SECONDS = 5.0
+
+
+def invalidate_pool_data(token_pair: str | None = None):
+    """Drop cached pool documents (e.g. after a swap changed the reserves)."""
+    if token_pair is None:
+        _POOL_DATA_CACHE.clear()
+    else:
+        _POOL_DATA_CACHE.pop(token_pair, None)
+
+
+def get_pool_data(token_pair: str, he_api_client: Api) -> dict:
+    """
+    Fetch the full pool document for a pair, with a short-lived cache.
+
+    Raises PoolDoesNotExist when the pair is unknown. Repeated reads within
+    _POOL_DATA_TTL_SECONDS reuse the cached document instead of issuing
+    another RPC.
+    """
+    cached = _POOL_DATA_CACHE.get(token_pair)
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < _POOL_DATA_TTL_SECONDS:
+        return cached[1]
+    # find_one already returns the plain pool document, so the common path
+    # skips both Pool hydration and the dict(pool_obj) copy.
+    try:
+        data = he_api_client.find_one(
+            "marketpools", "pools", query={"tokenPair": token_pair}
+        )
+    except Exception as e:
+        logger.debug(
+            "Direct pool query failed for %s (%s); falling back to Pool object.",
+            token_pair,
+            e,
+        )
+        data = None
+    else:
+        # Some API versions wrap find_one results in a list.
+        if isinstance(data, list):
+            data = data[0] if data else None
+        if not data:
+            # The query worked and found nothing: the pair is unknown, so
+            # don't spend a second RPC on Pool just to learn that again.
+            raise PoolDoesNotExist(token_pair)
+    if not data:
+        data = dict(Pool(token_pair, api=he_api_client))
+    _POOL_DATA_CACHE[token_pair] = (now, data)
+    return data
 
 
 def fetch_current_pool_price(token_pair_str: str, he_api_client: Api) -> Decimal | None:
@@ -128,7 +490,69 @@ def fetch_current_pool_price(token_pair_str: str, he_api_client: Api) -> Decimal
 
     For a pair like 'BASE:QUOTE', returns price of QUOTE in BASE units.
     Example: For 'BASE_CURRENCY:TARGET_ASSET', returns BASE_CURRENCY per TARGET_ASSET.
+    Results are cached per (pair, latest block number) to suppress duplicate
+    reads of state that cannot have changed yet.
+    """
+    try:
+        latest_block = he_api_client.get_latest_block_info().get("blockNumber")
+    except Exception:
+        latest_block = None
+
+    if latest_block is not None:
+        cached_price = _PRICE_CACHE.get((token_pair_str, latest_block))
+        if cached_price is not None:
+            logger.debug(
+                "Pool price cache hit for %s at block %s: %s",
+                token_pair_str,
+                latest_block,
+                cached_price,
+            )
+            return cached_price
+
+    quote_price = _fetch_pool_price_fast(token_pair_str, he_api_client)
+    if quote_price is None:
+        quote_price = _fetch_pool_price_via_object(token_pair_str, he_api_client)
+
+    if quote_price is not None and latest_block is not None:
+        if len(_PRICE_CACHE) >= _PRICE_CACHE_MAX_ENTRIES:
+            _PRICE_CACHE.clear()
+        _PRICE_CACHE[(token_pair_str, latest_block)] = quote_price
+    return quote_price
+
+
+def _fetch_pool_price_fast(token_pair_str: str, he_api_client: Api) -> Decimal | None:
+    """
+    Read quotePrice with a single find_one, skipping Pool object hydration.
+
+    Pool(...) pulls down and hydrates the full pool record just so we can read
+    one field; a direct contract query returns the same row without the
+    object-construction overhead.
     """
+    try:
+        row = he_api_client.find_one(
+            "marketpools", "pools", query={"tokenPair": token_pair_str}
+        )
+    except Exception as e:
+        logger.debug(
+            "Direct pool query failed for %s (%s); falling back to Pool object.",
+            token_pair_str,
+            e,
+        )
+        return None
+    # Some API versions wrap find_one results in a list.
+    if isinstance(row, list):
+        row = row[0] if row else None
+    if not row or row.get("quotePrice") is None:
+        return None
+    quote_price = Decimal(str(row["quotePrice"]))
+    logger.info("Fetched pool quotePrice for %s: %s", token_pair_str, quote_price)
+    return quote_price
+
+
+def _fetch_pool_price_via_object(
+    token_pair_str: str, he_api_client: Api
+) -> Decimal | None:
+    """Fallback price read via nectarengine.Pool (original code path)."""
     try:
         # The Api object for nectarengine will be implicitly created by Pool if not passed
         # or can be passed if specific configuration is needed.
@@ -137,120 +561,545 @@ def fetch_current_pool_price(token_pair_str: str, he_api_client: Api) -> Decimal
         quote_price = pool_obj.get_quote_price()
 
         if quote_price is not None:
-            logging.info(f"Fetched pool quotePrice for {token_pair_str}: {quote_price}")
+            logger.info(
+                "Fetched pool quotePrice for %s: %s", token_pair_str, quote_price
+            )
             return quote_price
         else:
-            logging.warning(
-                f"Could not retrieve quotePrice for {token_pair_str}. Pool data: {pool_obj}"
+            logger.warning(
+                "Could not retrieve quotePrice for %s. Pool data: %s",
+                token_pair_str,
+                pool_obj,
             )
             return None
     except Exception as e:
         # Catching a broad exception here, consider more specific ones like PoolDoesNotExist if appropriate
-        logging.error(f"Error fetching pool price for {token_pair_str}: {e}")
+        logger.error("Error fetching pool price for %s: %s", token_pair_str, e)
         return None
 
 
+def compute_swap_amounts(
+    amount_to_trade: Decimal,
+    pool_price: Decimal,
+    target_asset_precision: int,
+    base_currency_precision: int,
+    slippage_tolerance: Decimal,
+) -> tuple[Decimal, Decimal]:
+    """
+    Compute (expected_out, min_amount_out) for a swap in the base currency.
+
+    The arithmetic runs in integer fixed-point: token precisions are known,
+    so the amounts are exact in scaled ints, and native int math avoids the
+    much slower Decimal context machinery on the sizing path. Slippage is
+    applied in basis points. Decimals are only rebuilt at the boundary,
+    already quantized to the base currency precision.
+    """
+    target_scale = 10**target_asset_precision
+    base_scale = 10**base_currency_precision
+    amount_int = int(
+        (amount_to_trade * target_scale).to_integral_value(rounding=ROUND_DOWN)
+    )
+    price_int = int((pool_price * base_scale).to_integral_value(rounding=ROUND_DOWN))
+    expected_out_int = amount_int * price_int // target_scale
+    slippage_bps = int(slippage_tolerance * 10000)
+    min_out_int = expected_out_int * (10000 - slippage_bps) // 10000
+    return (
+        Decimal(expected_out_int).scaleb(-base_currency_precision),
+        Decimal(min_out_int).scaleb(-base_currency_precision),
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _quantizer(precision: int) -> Decimal:
+    """Return the Decimal quantizer for a precision (memoized; few exist)."""
+    # scaleb avoids the string-parsing path of Decimal(f"1e-{precision}")
+    return Decimal(1).scaleb(-precision)
+
+
 def format_amount(amount: Decimal, precision: int) -> str:
     """Format a Decimal amount to a string with specified precision."""
-    quantizer = Decimal(f"1e-{precision}")
     # Always round down to avoid attempting to spend more than available or exceeding precision
-    return str(amount.quantize(quantizer, rounding=ROUND_DOWN))
+    return str(amount.quantize(_quantizer(precision), rounding=ROUND_DOWN))
 
 
-def confirm_hive_engine_transaction(  # noqa: C901
-    he_api_client: Api,  # Changed from hv_client: Hive
-    tx_id: str,
+class _LazyAmount:
+    """
+    Defer format_amount until a log handler actually renders the record.
+
+    Passed as a %s argument to the logger, the Decimal quantize/str work only
+    happens inside Formatter.format, so it is skipped entirely when the
+    record's level is filtered out.
+    """
+
+    __slots__ = ("amount", "precision")
+
+    def __init__(self, amount: Decimal, precision: int):
+        self.amount = amount
+        self.precision = precision
+
+    def __str__(self) -> str:
+        return format_amount(self.amount, self.precision)
+
+
+# Known key paths for the transaction id in a broadcast receipt, tried in
+# order; receipts vary in shape depending on the broadcaster.
+_TRX_ID_PATHS = (("trx_id",), ("id",), ("result", "id"))
+
+
+def extract_trx_id(receipt) -> str | None:
+    """Pull the transaction id out of a broadcast receipt, or None if absent."""
+    if not isinstance(receipt, dict):
+        return None
+    for path in _TRX_ID_PATHS:
+        value = receipt
+        for key in path:
+            if not isinstance(value, dict):
+                value = None
+                break
+            value = value.get(key)
+        if value:
+            return value
+    return None
+
+
+# Above this size, HE log payloads are streamed with ijson (when installed)
+# rather than decoded into one big tree up front.
+_STREAM_PARSE_THRESHOLD_BYTES = 64 * 1024
+
+# (contract, event) keys the confirmation paths look for in HE log events,
+# interned once so the scans compare against a single tuple. _CE pulls both
+# fields in one C-level call; HE log events always carry them, and the scan
+# sites sit inside the confirmation paths' existing exception handlers.
+_CE = itemgetter("contract", "event")
+_TRANSFER_FROM_CONTRACT_KEY = ("tokens", "transferFromContract")
+_SWAP_TOKENS_KEY = ("marketpools", "swapTokens")
+_ADD_LIQUIDITY_KEY = ("marketpools", "addLiquidity")
+
+
+def _fast_has_errors(logs_str: str) -> bool:
+    """
+    Cheap substring pre-check for an 'errors' field in an HE logs payload.
+
+    False means the payload definitely carries no errors, so callers can skip
+    decoding it for the error check. True only means "maybe": the substring
+    could sit inside event data, so a positive still needs a real parse.
+    """
+    return '"errors"' in logs_str
+
+
+def _he_logs_errors(logs_str: str, logs_data: dict | None):
+    """
+    Return the 'errors' value of an HE logs payload, or None if absent/empty.
+
+    Uses the already-parsed dict when available; for large unparsed payloads
+    it streams just the 'errors' array with ijson, and skips even that when
+    the substring pre-check rules errors out.
+    """
+    if logs_data is not None:
+        errors = logs_data.get("errors") if isinstance(logs_data, dict) else None
+        return errors or None
+    if ijson is None or not _fast_has_errors(logs_str):
+        return None
+    with io.BytesIO(logs_str.encode()) as buf:
+        return next(ijson.items(buf, "errors.item"), None)
+
+
+def _iter_he_log_events(logs_str: str, logs_data: dict | None):
+    """
+    Yield events from an HE logs payload.
+
+    Uses the already-parsed dict when available. For large payloads that were
+    deliberately left unparsed, events are streamed one at a time with ijson,
+    so a caller that breaks at the first match never materializes the rest.
+    """
+    if logs_data is not None:
+        if isinstance(logs_data, dict):
+            yield from logs_data.get("events", [])
+        return
+    if ijson is None:
+        return
+    with io.BytesIO(logs_str.encode()) as buf:
+        yield from ijson.items(buf, "events.item")
+
+
+def _parse_he_logs(
+    logs_str, tx_id: str, label: str = "Transaction"
+) -> tuple[bool, dict | None]:
+    """
+    Validate and decode the HE logs payload of a confirmed transaction.
+
+    Returns (had_error, logs_data). had_error is True when the payload is
+    malformed, undecodable, or reports Hive Engine errors; logs_data is the
+    parsed dict when one was produced (None for absent logs and for oversized
+    payloads, which the streaming event helpers handle without a full parse).
+    """
+    if not (isinstance(logs_str, str) and logs_str.strip()):
+        if logs_str is not None:  # Logs exist but not a string, or empty string
+            logger.warning(
+                "HE logs for %s are not a non-empty string: '%s'. Cannot parse for errors/events.",
+                tx_id,
+                logs_str,
+            )
+            return True, None
+        # No logs at all: no errors, but also no events for the caller to find.
+        return False, None
+
+    logs_data = None
+    try:
+        # Outsized payloads stay unparsed and are streamed piecemeal with
+        # ijson instead.
+        if ijson is None or len(logs_str) <= _STREAM_PARSE_THRESHOLD_BYTES:
+            logs_data = _loads(logs_str)
+        he_log_errors = _he_logs_errors(logs_str, logs_data)
+        if he_log_errors:
+            logger.error(
+                "%s %s failed with errors from HE logs: %s",
+                label,
+                tx_id,
+                he_log_errors,
+            )
+            return True, logs_data
+    except ValueError:
+        # orjson and stdlib json both raise ValueError subclasses
+        logger.warning(
+            "Could not JSON decode HE logs string for %s: %s", tx_id, logs_str
+        )
+        return True, None
+    return False, logs_data
+
+
+def _find_event(logs_str, logs_data, key: tuple[str, str], predicate=None):
+    """
+    Return the first HE log event matching the (contract, event) key, or None.
+
+    An optional predicate receives the event's 'data' dict for further
+    filtering. Stops at the first match, so large streamed payloads never
+    materialize past it.
+    """
+    if logs_data is None and not (isinstance(logs_str, str) and logs_str.strip()):
+        # No parsed dict and nothing to stream: no events to find.
+        return None
+    candidates = (e for e in _iter_he_log_events(logs_str, logs_data) if _CE(e) == key)
+    if predicate is not None:
+        candidates = (e for e in candidates if predicate(e.get("data", {})))
+    return next(candidates, None)
+
+
+def _index_events(logs_str, logs_data) -> dict[tuple[str, str], list]:
+    """
+    Index HE log events by (contract, event) key in a single pass.
+
+    When a confirmation block needs more than one event from the same payload,
+    one scan plus hash lookups beats re-walking the events array per lookup.
+    Events sharing a key keep their original order.
+    """
+    by_key: dict[tuple[str, str], list] = {}
+    if logs_data is not None or (isinstance(logs_str, str) and logs_str.strip()):
+        for event in _iter_he_log_events(logs_str, logs_data):
+            by_key.setdefault(_CE(event), []).append(event)
+    return by_key
+
+
+def _swap_received_from_logs(
+    logs_str, logs_data, tx_id: str, base_currency: str
+) -> Decimal:
+    """
+    Extract the base-currency amount a confirmed swap paid out, or ZERO.
+
+    Scans the transaction's already-validated event logs for the
+    marketpools -> account transferFromContract event, logs the swap fee when
+    present, and returns the received quantity. Returns ZERO when the event
+    is missing, malformed, or carries no quantity, so callers can treat any
+    non-positive result as an unconfirmed swap.
+    """
+    try:
+        # Two lookups come out of this payload (transfer + fee), so index it
+        # once instead of scanning the events twice.
+        events_by_key = _index_events(logs_str, logs_data)
+        transfer_event = next(
+            (
+                e
+                for e in events_by_key.get(_TRANSFER_FROM_CONTRACT_KEY, ())
+                if e.get("data", {}).get("from") == "marketpools"
+                and e.get("data", {}).get("to") == HIVE_ACCOUNT_NAME
+                and e.get("data", {}).get("symbol") == base_currency
+            ),
+            None,
+        )
+        quantity_received_str = (transfer_event or {}).get("data", {}).get("quantity")
+        if not quantity_received_str:
+            return ZERO
+        received = Decimal(quantity_received_str)
+        logger.info(
+            "Swap successful! Received %s %s from TX: %s (via transferFromContract event).",
+            received,
+            base_currency,
+            tx_id,
+        )
+        # Log the fee paid from marketpools.swapTokens event
+        fee_events = events_by_key.get(_SWAP_TOKENS_KEY)
+        fee_event = fee_events[0] if fee_events else None
+        fee_data = (fee_event or {}).get("data", {}).get("fee", {})
+        fee_amount = fee_data.get("amount")
+        fee_symbol = fee_data.get("symbol")
+        if fee_amount and fee_symbol:
+            logger.info(
+                "Swap fee paid: %s %s (from marketpools.swapTokens event).",
+                fee_amount,
+                fee_symbol,
+            )
+        return received
+    except Exception as e_event_parse:
+        logger.error(
+            "Error parsing events from HE logs for %s: %s", tx_id, e_event_parse
+        )
+        return ZERO
+
+
+def block_watcher(he_api_client: Api, poll_interval_seconds: float | None = None):
+    """
+    Yield the latest Hive Engine block number once per poll.
+
+    Pool state and transaction confirmations can only change when a block is
+    produced, so pollers should wake on this generator instead of sleeping
+    for fixed intervals. Every poll yields -- including unchanged heads and
+    failed reads (as None) -- so callers always regain control to enforce
+    their own deadlines even if the chain head stalls; a new block is
+    detected by comparing successive yielded values. Runs until the caller
+    stops iterating.
+    """
+    if poll_interval_seconds is None:
+        poll_interval_seconds = BLOCK_POLL_INTERVAL_SECONDS
+    while True:
+        try:
+            latest_block = he_api_client.get_latest_block_info().get("blockNumber")
+        except Exception as e:
+            logger.debug("Block watcher could not fetch latest block info: %s", e)
+            latest_block = None
+        yield latest_block
+        time.sleep(poll_interval_seconds)
+
+
+def _wait_for_next_he_block(he_api_client: Api, max_wait_seconds: float):
+    """
+    Wait until a new Hive Engine block arrives, or max_wait_seconds elapses.
+
+    Thin deadline wrapper around block_watcher(); a transaction can only
+    confirm when a new block is produced, so polling get_transaction_info
+    more often than once per block is wasted RPC.
+    """
+    deadline = time.monotonic() + max_wait_seconds
+    start_block = None
+    for latest_block in block_watcher(he_api_client):
+        if latest_block is not None:
+            if start_block is None:
+                start_block = latest_block
+            elif latest_block != start_block:
+                return
+        if time.monotonic() >= deadline:
+            return
+
+
+# Receipts of transactions this process has already confirmed, so a repeat
+# confirmation of the same id is answered without polling the node again.
+_CONFIRMED_TX_CACHE: dict[str, dict] = {}
+
+
+def confirm_hive_engine_transactions(  # noqa: C901
+    he_api_client: Api,
+    tx_ids: list[str],
     initial_delay_seconds: int = HIVE_ENGINE_TX_CONFIRM_DELAY_SECONDS,
     max_retries: int = MAX_TX_INFO_RETRIES,
     retry_delay_seconds: int = TX_INFO_RETRY_DELAY_SECONDS,
-):
+) -> dict[str, dict]:
     """
-    Confirm a Hive Engine transaction by polling and checking its logs.
-
-    Uses global configuration for delays and retries.
+    Confirm a batch of Hive Engine transactions in one polling loop.
+
+    All ids share a single initial delay and a single retry/backoff schedule,
+    so confirming N broadcasts costs max(delays) instead of the sum of N
+    serial confirmation loops. Returns {tx_id: tx_info} for every confirmed
+    transaction; raises TransactionConfirmationError as soon as any
+    transaction fails with Hive Engine errors, or when retries run out with
+    ids still pending. Uses global configuration for delays and retries.
     """
     if not he_api_client:
         msg = (
             "nectarengine.Api client instance not available for confirming transaction."
         )
-        logging.error(msg)
+        logger.error(msg)
         raise TransactionConfirmationError(msg)
 
-    logging.info(
-        f"Waiting {initial_delay_seconds}s before first check for tx {tx_id}..."
+    # Serve ids this process already confirmed straight from the cache so a
+    # repeat confirmation never re-polls the node.
+    pending = [tx_id for tx_id in tx_ids if tx_id not in _CONFIRMED_TX_CACHE]
+    confirmed: dict[str, dict] = {
+        tx_id: _CONFIRMED_TX_CACHE[tx_id]
+        for tx_id in tx_ids
+        if tx_id in _CONFIRMED_TX_CACHE
+    }
+    if not pending:
+        return confirmed
+
+    logger.info(
+        "Waiting %ss before first check for tx(s) %s...",
+        initial_delay_seconds,
+        ", ".join(pending),
     )
     time.sleep(initial_delay_seconds)
 
+    delay = retry_delay_seconds
     for attempt in range(max_retries):  # 0 to max_retries-1
-        logging.info(f"Confirmation attempt {attempt + 1}/{max_retries} for tx {tx_id}")
-        try:
-            tx_info = he_api_client.get_transaction_info(
-                txid=tx_id
-            )  # Use nectarengine.Api
+        for tx_id in list(pending):
+            logger.info(
+                "Confirmation attempt %s/%s for tx %s", attempt + 1, max_retries, tx_id
+            )
+            try:
+                tx_info = he_api_client.get_transaction_info(
+                    txid=tx_id
+                )  # Use nectarengine.Api
 
-            if (
-                tx_info
-                and isinstance(tx_info, dict)
-                and tx_info.get("blockNumber", 0) > 0
-            ):  # Corrected key to blockNumber
-                logging.info(
-                    f"Transaction {tx_id} confirmed in block {tx_info['blockNumber']}."
-                )  # Corrected key to blockNumber
-                if "logs" in tx_info and tx_info["logs"]:
-                    try:
-                        logs_data = json.loads(tx_info["logs"])
-                        if "errors" in logs_data and logs_data["errors"]:
-                            error_message = f"Transaction {tx_id} confirmed on chain but failed with Hive Engine errors: {logs_data['errors']}"
-                            logging.error(error_message)
+                if (
+                    tx_info
+                    and isinstance(tx_info, dict)
+                    and tx_info.get("blockNumber", 0) > 0
+                ):  # Corrected key to blockNumber
+                    logger.info(
+                        "Transaction %s confirmed in block %s.",
+                        tx_id,
+                        tx_info["blockNumber"],
+                    )
+                    # Transaction is visible on chain; reset the backoff so any
+                    # remaining polls (e.g. while logs settle) stay snappy.
+                    delay = retry_delay_seconds
+                    if "logs" in tx_info and tx_info["logs"]:
+                        try:
+                            # Most confirmations carry no errors; the substring
+                            # pre-check skips decoding the logs just to look
+                            # for them.
+                            logs_errors = None
+                            if _fast_has_errors(tx_info["logs"]):
+                                logs_data = _loads(tx_info["logs"])
+                                logs_errors = (
+                                    logs_data.get("errors")
+                                    if isinstance(logs_data, dict)
+                                    else None
+                                )
+                            if logs_errors:
+                                error_message = f"Transaction {tx_id} confirmed on chain but failed with Hive Engine errors: {logs_errors}"
+                                logger.error(error_message)
+                                raise TransactionConfirmationError(
+                                    error_message
+                                )  # Fail immediately on HE error
+                            else:
+                                logger.info(
+                                    "Transaction %s confirmed successfully by Hive Engine.",
+                                    tx_id,
+                                )
+                                confirmed[tx_id] = tx_info
+                                _CONFIRMED_TX_CACHE[tx_id] = tx_info
+                                pending.remove(tx_id)
+                        except ValueError as je:
+                            # orjson and stdlib json both raise ValueError subclasses
+                            error_message = f"Could not parse logs for transaction {tx_id}: {tx_info['logs']}. Error: {str(je)}"
+                            logger.error(error_message)
+                            if attempt == max_retries - 1:  # Last attempt
+                                raise TransactionConfirmationError(
+                                    error_message
+                                ) from je
+                    else:  # block_num > 0 but no logs or empty logs
+                        logger.warning(
+                            "Transaction %s confirmed on chain (block %s), but no Hive Engine 'logs' field or logs are empty.",
+                            tx_id,
+                            tx_info["blockNumber"],
+                        )
+                        if attempt == max_retries - 1:  # Last attempt
                             raise TransactionConfirmationError(
-                                error_message
-                            )  # Fail immediately on HE error
-                        else:
-                            logging.info(
-                                f"Transaction {tx_id} confirmed successfully by Hive Engine."
+                                f"Transaction {tx_id} confirmed on chain but no Hive Engine logs found after {max_retries} attempts."
                             )
-                            return tx_info
-                    except json.JSONDecodeError as je:
-                        error_message = f"Could not parse logs for transaction {tx_id}: {tx_info['logs']}. Error: {str(je)}"
-                        logging.error(error_message)
-                        if attempt == max_retries - 1:  # Last attempt
-                            raise TransactionConfirmationError(error_message) from je
-                else:  # block_num > 0 but no logs or empty logs
-                    logging.warning(
-                        f"Transaction {tx_id} confirmed on chain (block {tx_info['blockNumber']}), but no Hive Engine 'logs' field or logs are empty."
-                    )  # Corrected key to blockNumber
-                    if attempt == max_retries - 1:  # Last attempt
-                        raise TransactionConfirmationError(
-                            f"Transaction {tx_id} confirmed on chain but no Hive Engine logs found after {max_retries} attempts."
-                        )
-            else:  # Not confirmed on chain yet
-                logging.info(
-                    f"Transaction {tx_id} not yet confirmed on chain or not found. tx_info: {json.dumps(tx_info) if tx_info else 'None'}"
+                else:  # Not confirmed on chain yet
+                    # Pass tx_info as a lazy argument: logging only stringifies
+                    # it when a handler actually emits the record, so
+                    # filtered-out records skip the multi-KB serialization.
+                    logger.info(
+                        "Transaction %s not yet confirmed on chain or not found. tx_info: %s",
+                        tx_id,
+                        tx_info if tx_info else "None",
+                    )
+
+            except TransactionConfirmationError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "Error during transaction confirmation attempt %s for %s: %s",
+                    attempt + 1,
+                    tx_id,
+                    str(e),
                 )
+                if attempt == max_retries - 1:  # Last attempt
+                    raise TransactionConfirmationError(
+                        f"Transaction {tx_id} failed to confirm after {max_retries} retries due to error: {str(e)}"
+                    ) from e
 
-        except Exception as e:
-            logging.warning(
-                f"Error during transaction confirmation attempt {attempt + 1} for {tx_id}: {str(e)}"
-            )
-            if attempt == max_retries - 1:  # Last attempt
-                raise TransactionConfirmationError(
-                    f"Transaction {tx_id} failed to confirm after {max_retries} retries due to error: {str(e)}"
-                ) from e
+        if not pending:
+            return confirmed
 
         if attempt < max_retries - 1:  # If not the last attempt
-            logging.info(
-                f"Waiting {retry_delay_seconds}s before next attempt for tx {tx_id}..."
+            logger.info(
+                "Waiting up to %ss (or next HE block) before next attempt for tx(s) %s...",
+                delay,
+                ", ".join(pending),
             )
-            time.sleep(retry_delay_seconds)
+            _wait_for_next_he_block(he_api_client, delay)
+            delay = min(delay * 2, TX_INFO_BACKOFF_CAP_SECONDS)
 
     # If loop finishes, it means all retries exhausted without success
-    final_msg = (
-        f"Transaction {tx_id} could not be confirmed after {max_retries} attempts."
-    )
-    logging.error(final_msg)
+    final_msg = f"Transaction(s) {', '.join(pending)} could not be confirmed after {max_retries} attempts."
+    logger.error(final_msg)
     raise TransactionConfirmationError(final_msg)
 
 
+def confirm_hive_engine_transaction(
+    he_api_client: Api,  # Changed from hv_client: Hive
+    tx_id: str,
+    initial_delay_seconds: int = HIVE_ENGINE_TX_CONFIRM_DELAY_SECONDS,
+    max_retries: int = MAX_TX_INFO_RETRIES,
+    retry_delay_seconds: int = TX_INFO_RETRY_DELAY_SECONDS,
+):
+    """
+    Confirm a single Hive Engine transaction by polling and checking its logs.
+
+    Thin wrapper around confirm_hive_engine_transactions for the common
+    one-broadcast case.
+    """
+    return confirm_hive_engine_transactions(
+        he_api_client,
+        [tx_id],
+        initial_delay_seconds=initial_delay_seconds,
+        max_retries=max_retries,
+        retry_delay_seconds=retry_delay_seconds,
+    )[tx_id]
+
+
+# Every skipped LP deposit is reported through one record shape,
+# "LP deposit skipped: reason=... detail=...", so a single emit path runs
+# per decision and downstream log processors can filter on reason= without
+# parsing prose. Reason codes and detail phrases are interned constants.
+_LP_SKIP_DETAILS = {
+    "NOT_SWAPPED": "target asset was not swapped, or swap was not successful",
+    "ZERO_RECEIVED": "swap was marked successful, but zero base currency was received",
+    "AMOUNTS_INVALID": "deposit amounts could not be calculated/validated, or one is zero/None",
+}
+
+
+def _classify_skip(swapped: bool, received_positive: bool, amounts_valid: bool) -> str:
+    """Return the interned reason code for a skipped LP deposit."""
+    if not swapped:
+        return "NOT_SWAPPED"
+    if not received_positive:
+        return "ZERO_RECEIVED"
+    return "AMOUNTS_INVALID" if not amounts_valid else "UNKNOWN"
+
+
 def main():  # noqa: C901
     """
     Run the main function for the liquidity bot.
@@ -303,50 +1152,61 @@ def main():  # noqa: C901
         action="store_true",
         help="Simulate transactions without broadcasting.",
     )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Only log warnings and errors; INFO records are rejected before they are built.",
+    )
+    parser.add_argument(
+        "--batched-broadcast",
+        action="store_true",
+        help=(
+            "Broadcast the swap and the LP deposit together in a single "
+            "custom_json transaction (one block instead of two). The deposit "
+            "must be sized before the swap executes, so it uses the slippage "
+            "floor (minAmountOut) rather than actual proceeds; any surplus "
+            "stays in the wallet. No effect with --dry-run."
+        ),
+    )
+    parser.add_argument(
+        "--block-poll-ms",
+        type=int,
+        default=1000,
+        help="Hive Engine block watcher cadence in milliseconds (default: 1000).",
+    )
 
     args = parser.parse_args()
 
-    # Dynamically fetch token precisions
-    he_api_client_for_precision = Api(url=HE_API_URL)
+    # Bind the two hot symbols to locals once, straight off the parse; the
+    # body below references them dozens of times and LOAD_FAST beats repeated
+    # attribute lookups on args.
+    base_currency = args.base_currency
+    target_asset = args.target_asset
 
-    try:
-        target_asset_obj = Token(args.target_asset, api=he_api_client_for_precision)
-        target_asset_info = target_asset_obj.get_info()
-        if not target_asset_info or target_asset_info.get("precision") is None:
-            logging.error(
-                f"Precision not found for target asset '{args.target_asset}' after fetching info. Exiting."
-            )
-            sys.exit(1)
-        target_asset_precision = int(target_asset_info["precision"])
-    except Exception as e:
-        logging.error(
-            f"Could not fetch token info or precision for target asset '{args.target_asset}': {e}. Exiting."
-        )
-        sys.exit(1)
-    logging.info(f"Fetched precision for {args.target_asset}: {target_asset_precision}")
+    if args.quiet:
+        # Raising the root level turns every logger.info below into an
+        # isEnabledFor fast-reject instead of a full LogRecord build.
+        logging.getLogger().setLevel(logging.WARNING)
 
-    try:
-        base_currency_obj = Token(args.base_currency, api=he_api_client_for_precision)
-        base_currency_info = base_currency_obj.get_info()
-        if not base_currency_info or base_currency_info.get("precision") is None:
-            logging.error(
-                f"Precision not found for base currency '{args.base_currency}' after fetching info. Exiting."
-            )
-            sys.exit(1)
-        base_currency_precision = int(base_currency_info["precision"])
-    except Exception as e:
-        logging.error(
-            f"Could not fetch token info or precision for base currency '{args.base_currency}': {e}. Exiting."
-        )
-        sys.exit(1)
-    logging.info(
-        f"Fetched precision for {args.base_currency}: {base_currency_precision}"
-    )
+    global BLOCK_POLL_INTERVAL_SECONDS
+    BLOCK_POLL_INTERVAL_SECONDS = max(args.block_poll_ms, 100) / 1000.0
+
+    # Shared API client used for all Hive Engine reads and confirmations
+    he_api_client = get_he_api_client()
 
     # Update parser description for clarity in logs if needed, though --help won't reflect this.
-    parser.description = f"Automated {args.target_asset} token trading and LP management against {args.base_currency}."
+    parser.description = f"Automated {target_asset} token trading and LP management against {base_currency}."
+
+    config_data = load_config()
+    if config_data is None:
+        return 1
+    if not load_credentials(config_data):  # Load HIVE_ACCOUNT_NAME and HIVE_ACTIVE_KEY
+        return 1
 
-    if not load_credentials():  # Load HIVE_ACCOUNT_NAME and HIVE_ACTIVE_KEY
+    # The active key is only needed when we actually broadcast; dry runs can
+    # proceed (and be debugged) without one.
+    if not args.dry_run and not require_active_key(config_data):
         return 1
 
     # Use account from arg if provided, otherwise from config
@@ -354,122 +1214,194 @@ def main():  # noqa: C901
     amount_to_trade = args.amount
     price_threshold = args.threshold
 
-    if not HIVE_ACTIVE_KEY:
-        # This check is somewhat redundant due to load_credentials, but good for clarity
-        logging.error(
-            "HIVE_ACTIVE_KEY not loaded. Check config.json."
-        )  # Should be caught by load_credentials
-        return 1
-
     if not account_name:
-        logging.error(
+        logger.error(
             "HIVE_ACCOUNT_NAME not configured. Check config.json or use --account argument."
-        )  # Should be caught by load_credentials
+        )
         return 1
 
-    logging.info(f"--- {args.target_asset} Trader Bot ---")
-    logging.info(f"Account: {account_name}")
-    logging.info(
-        f"Trading {amount_to_trade} {args.target_asset} if LP price > {price_threshold} {args.base_currency}"
+    logger.info("--- %s Trader Bot ---", target_asset)
+    logger.info("Account: %s", account_name)
+    logger.info(
+        "Trading %s %s if LP price > %s %s",
+        amount_to_trade,
+        target_asset,
+        price_threshold,
+        base_currency,
     )
     if args.dry_run:
-        logging.warning("DRY RUN MODE ENABLED - No transactions will be broadcast.")
+        logger.warning("DRY RUN MODE ENABLED - No transactions will be broadcast.")
 
     try:
         # he_api object is no longer needed directly; nectarengine objects will manage API calls.
-        hv = Hive(
-            node=HIVE_NODES, keys=[HIVE_ACTIVE_KEY]
-        )  # Ensure HIVE_NODES is defined
-
-        if not hv and not args.dry_run:
-            # This check is primarily for ensuring HIVE_ACTIVE_KEY was loaded for broadcasting.
-            # nectarengine read-only calls (like Pool price fetching) can work without keys.
-            logging.error(
-                f"Hive client could not be initialized (HIVE_ACTIVE_KEY: {'loaded' if HIVE_ACTIVE_KEY else 'missing'}). Aborting."
+        # Dry runs never broadcast, so skip the Hive client entirely: its
+        # construction validates keys and handshakes with a node, which is
+        # pure startup cost when no transaction will be signed. The active-key
+        # requirement for live runs is already enforced by require_active_key.
+        if args.dry_run:
+            hv = None
+            lp_handler = None
+        else:
+            hv = Hive(
+                node=get_hive_nodes_cached(),
+                keys=[HIVE_ACTIVE_KEY] if HIVE_ACTIVE_KEY else [],
             )
-            return 1
-
-        # Instantiate LiquidityPool handler for use with swap, add_liquidity etc.
-        lp_handler = LiquidityPool(blockchain_instance=hv)
-        # Instantiate nectarengine.Api client for transaction confirmation
-        he_api_client = Api(url=HE_API_URL)
+            # Instantiate LiquidityPool handler for use with swap, add_liquidity etc.
+            lp_handler = LiquidityPool(blockchain_instance=hv)
 
         # --- 1. Check Liquidity Pool Price & Potentially Swap TARGET_ASSET for BASE_CURRENCY ---
         # For the target asset, the token pair with the base currency as base is typically 'BASE_CURRENCY:TARGET_ASSET'
         # The fetch_current_pool_price function expects the pair string where the price of the second token (quote) is returned in terms of the first (base).
         # So, for 'BASE_CURRENCY:TARGET_ASSET', it returns BASE_CURRENCY per TARGET_ASSET.
-        token_pair_for_swap_and_price_check = (
-            f"{args.base_currency}:{args.target_asset}"
+        token_pair_for_swap_and_price_check = f"{base_currency}:{target_asset}"
+
+        # Token precisions, pool price and wallet balance are independent
+        # network reads; run them in parallel so startup pays max(RTT), not
+        # the sum. Each future's error is handled individually below.
+        precisions_future = _RPC_EXECUTOR.submit(
+            resolve_token_precisions,
+            he_api_client,
+            [target_asset, base_currency],
         )
-        current_pool_price = fetch_current_pool_price(
-            token_pair_for_swap_and_price_check, he_api_client=he_api_client
+        price_future = _RPC_EXECUTOR.submit(
+            fetch_current_pool_price,
+            token_pair_for_swap_and_price_check,
+            he_api_client,
         )
+        balance_future = _RPC_EXECUTOR.submit(
+            _fetch_wallet_token_data,
+            account_name,
+            target_asset,
+            he_api_client,
+        )
+        block_future = _RPC_EXECUTOR.submit(he_api_client.get_latest_block_info)
+
+        try:
+            token_precisions = precisions_future.result()
+        except Exception as e:
+            logger.error("Could not fetch token precisions: %s. Exiting.", e)
+            return 1
+        target_asset_precision = token_precisions[target_asset]
+        base_currency_precision = token_precisions[base_currency]
+        logger.info(
+            "Fetched precision for %s: %s", target_asset, target_asset_precision
+        )
+        logger.info(
+            "Fetched precision for %s: %s", base_currency, base_currency_precision
+        )
+
+        try:
+            snapshot_block = (block_future.result() or {}).get("blockNumber")
+        except Exception as e_block:
+            logger.debug("Could not fetch latest HE block for snapshot: %s", e_block)
+            snapshot_block = None
+
+        try:
+            snapshot_balance = balance_future.result()
+        except TokenNotInWallet:
+            logger.error(
+                "Account %s does not have any %s tokens in wallet (or token doesn't exist). Skipping swap attempt.",
+                account_name,
+                target_asset,
+            )
+            snapshot_balance = None
+        except Exception as e_wallet_check:
+            logger.error(
+                "Error checking %s balance for %s: %s. Skipping swap attempt.",
+                target_asset,
+                account_name,
+                e_wallet_check,
+            )
+            snapshot_balance = None
+
+        # All trade decisions below work off this one snapshot; the price is
+        # not re-queried between sizing and broadcasting the swap.
+        snapshot = SwapSnapshot(
+            price=price_future.result(),
+            balance=snapshot_balance,
+            block=snapshot_block,
+        )
+        current_pool_price = snapshot.price
 
-        if current_pool_price is None or current_pool_price <= Decimal(0):
-            logging.error(
-                f"Could not determine current pool price for {token_pair_for_swap_and_price_check}, or price is zero. Exiting."
+        if current_pool_price is None or current_pool_price <= ZERO:
+            logger.error(
+                "Could not determine current pool price for %s, or price is zero. Exiting.",
+                token_pair_for_swap_and_price_check,
             )
             return 1
 
-        logging.info(
-            f"Current pool price for {args.target_asset} in {token_pair_for_swap_and_price_check} LP: {current_pool_price:.{target_asset_precision + 2}f} {args.base_currency} per {args.target_asset}."
+        logger.info(
+            "Current pool price for %s in %s LP: %.*f %s per %s.",
+            target_asset,
+            token_pair_for_swap_and_price_check,
+            target_asset_precision + 2,
+            current_pool_price,
+            base_currency,
+            target_asset,
         )
 
-        swap_hive_received = Decimal("0")  # Initialize
-        target_asset_swapped_successfully = False  # Initialize flag      # Check TARGET_ASSET balance before attempting swap
+        swap_hive_received = ZERO  # Initialize
+        target_asset_swapped_successfully = False  # Initialize flag
+        lp_deposit_completed_in_batch = (
+            False  # Set when --batched-broadcast lands both ops
+        )
+        # Check TARGET_ASSET balance (from the snapshot) before attempting swap
         can_swap_due_to_balance = False
-        try:
-            wallet = Wallet(account_name, api=he_api_client)
-            _token_data_swap = wallet.get_token(args.target_asset)
-            if _token_data_swap and "balance" in _token_data_swap:
-                current_target_asset_balance = Decimal(_token_data_swap["balance"])
-            else:
-                current_target_asset_balance = Decimal("0")
-                logging.warning(
-                    f"{args.target_asset} not found in wallet for {account_name} or balance data missing during swap check. Assuming 0 balance."
-                )
-            logging.info(
-                f"Current {args.target_asset} balance for {account_name}: {current_target_asset_balance}"
+        _token_data_swap = snapshot.balance
+        if _token_data_swap and "balance" in _token_data_swap:
+            current_target_asset_balance = Decimal(_token_data_swap["balance"])
+            logger.info(
+                "Current %s balance for %s: %s",
+                target_asset,
+                account_name,
+                current_target_asset_balance,
             )
             if current_target_asset_balance >= amount_to_trade:
                 can_swap_due_to_balance = True
             else:
-                logging.warning(
-                    f"Insufficient {args.target_asset} balance to swap. Have: {current_target_asset_balance}, Need: {amount_to_trade}. Skipping swap attempt."
+                logger.warning(
+                    "Insufficient %s balance to swap. Have: %s, Need: %s. Skipping swap attempt.",
+                    target_asset,
+                    current_target_asset_balance,
+                    amount_to_trade,
                 )
-        except TokenNotInWallet:
-            logging.error(
-                f"Account {account_name} does not have any {args.target_asset} tokens in wallet (or token doesn't exist). Skipping swap attempt."
-            )
-        except Exception as e_wallet_check:
-            logging.error(
-                f"Error checking {args.target_asset} balance for {account_name}: {e_wallet_check}. Skipping swap attempt."
+        else:
+            logger.warning(
+                "%s balance for %s unavailable in snapshot. Skipping swap attempt.",
+                target_asset,
+                account_name,
             )
 
         if can_swap_due_to_balance and current_pool_price > price_threshold:
-            logging.info(
-                f"Pool price ({current_pool_price:.{target_asset_precision + 2}f}) > threshold ({price_threshold:.{target_asset_precision + 2}f}). Proceeding with swap."
+            logger.info(
+                "Pool price (%.*f) > threshold (%.*f). Proceeding with swap.",
+                target_asset_precision + 2,
+                current_pool_price,
+                target_asset_precision + 2,
+                price_threshold,
             )
 
             sim_to_swap_str = format_amount(amount_to_trade, target_asset_precision)
-            logging.info(
-                f"Attempting to swap {sim_to_swap_str} {args.target_asset} for {args.base_currency} via {token_pair_for_swap_and_price_check} LP."
+            logger.info(
+                "Attempting to swap %s %s for %s via %s LP.",
+                sim_to_swap_str,
+                target_asset,
+                base_currency,
+                token_pair_for_swap_and_price_check,
             )
 
-            # Calculate expected SWAP.HIVE out (ideal, before fees/slippage)
-            expected_swap_hive_out = amount_to_trade * current_pool_price
-            # For minAmountOut, apply a slippage tolerance, e.g., 1% to 5%
-            # slippage_tolerance = Decimal('0.01') # 1% slippage
-            # min_amount_out_decimal = expected_swap_hive_out * (Decimal('1') - slippage_tolerance)
-            # min_amount_out_str = format_amount(min_amount_out_decimal, base_currency_precision)
-            # For now, we'll just log the expected amount and simulate for dry run.
-
             # Define slippage tolerance, e.g., 1% (0.01) to 5% (0.05)
             slippage_tolerance = Decimal(
                 os.getenv("SLIPPAGE_TOLERANCE", "0.01")
             )  # Default to 1% if not set in .env
-            min_amount_out_decimal = expected_swap_hive_out * (
-                Decimal("1") - slippage_tolerance
+            # Expected SWAP.HIVE out (ideal, before fees) and minAmountOut
+            # with slippage applied, computed in integer fixed-point.
+            expected_swap_hive_out, min_amount_out_decimal = compute_swap_amounts(
+                amount_to_trade,
+                current_pool_price,
+                target_asset_precision,
+                base_currency_precision,
+                slippage_tolerance,
             )
             min_amount_out_str = format_amount(
                 min_amount_out_decimal, base_currency_precision
@@ -477,55 +1409,227 @@ def main():  # noqa: C901
 
             if not args.dry_run:
                 try:
-                    logging.info(
-                        f"Attempting to swap {sim_to_swap_str} {args.target_asset} for {args.base_currency} in pair {token_pair_for_swap_and_price_check} with min out {min_amount_out_str} {args.base_currency}."
-                    )
-                    broadcast_receipt = lp_handler.swap_tokens(
-                        account=account_name,
-                        token_pair=token_pair_for_swap_and_price_check,
-                        token_symbol=args.target_asset,
-                        token_amount=amount_to_trade,  # nectarengine will handle quantization
-                        trade_type="exactInput",
-                        min_amount_out=min_amount_out_decimal,  # nectarengine will handle string conversion
-                    )
-                    logging.info(
-                        f"lp_handler.swap_tokens broadcast receipt: {broadcast_receipt}"
+                    logger.info(
+                        "Attempting to swap %s %s for %s in pair %s with min out %s %s.",
+                        sim_to_swap_str,
+                        target_asset,
+                        base_currency,
+                        token_pair_for_swap_and_price_check,
+                        min_amount_out_str,
+                        base_currency,
                     )
+                    if args.batched_broadcast:
+                        # Both contract calls ride in one custom_json, so they
+                        # land in the same HE block and their sub-transactions
+                        # share one confirmation polling loop below. The
+                        # deposit is sized before the swap
+                        # executes, so it uses the guaranteed floor
+                        # (minAmountOut) instead of actual proceeds; whatever
+                        # the swap returns above the floor stays in the wallet.
+                        batched_base_deposit = min_amount_out_decimal.quantize(
+                            _quantizer(base_currency_precision), ROUND_DOWN
+                        )
+                        batched_quote_deposit = (
+                            batched_base_deposit / current_pool_price
+                        ).quantize(_quantizer(target_asset_precision), ROUND_DOWN)
+                        batched_payload = [
+                            {
+                                "contractName": "marketpools",
+                                "contractAction": "swapTokens",
+                                "contractPayload": {
+                                    "tokenPair": token_pair_for_swap_and_price_check,
+                                    "tokenSymbol": target_asset,
+                                    "tokenAmount": sim_to_swap_str,
+                                    "tradeType": "exactInput",
+                                    "minAmountOut": min_amount_out_str,
+                                },
+                            },
+                            {
+                                "contractName": "marketpools",
+                                "contractAction": "addLiquidity",
+                                "contractPayload": {
+                                    "tokenPair": token_pair_for_swap_and_price_check,
+                                    "baseQuantity": format_amount(
+                                        batched_base_deposit, base_currency_precision
+                                    ),
+                                    "quoteQuantity": format_amount(
+                                        batched_quote_deposit, target_asset_precision
+                                    ),
+                                },
+                            },
+                        ]
+                        broadcast_receipt = hv.custom_json(
+                            "ssc-mainnet-hive",
+                            batched_payload,
+                            required_auths=[account_name],
+                        )
+                        logger.info(
+                            "Batched swap+LP custom_json broadcast receipt: %s",
+                            broadcast_receipt,
+                        )
+                    else:
+                        broadcast_receipt = lp_handler.swap_tokens(
+                            account=account_name,
+                            token_pair=token_pair_for_swap_and_price_check,
+                            token_symbol=target_asset,
+                            token_amount=amount_to_trade,  # nectarengine will handle quantization
+                            trade_type="exactInput",
+                            min_amount_out=min_amount_out_decimal,  # nectarengine will handle string conversion
+                        )
+                        logger.info(
+                            "lp_handler.swap_tokens broadcast receipt: %s",
+                            broadcast_receipt,
+                        )
 
                     target_asset_swapped_successfully = False
-                    swap_hive_received = Decimal("0")
-                    transaction_id = None
+                    swap_hive_received = ZERO
 
-                    if broadcast_receipt and isinstance(broadcast_receipt, dict):
-                        logging.debug(
-                            f"Attempting to extract transaction_id from receipt: {broadcast_receipt}"
-                        )
-                        transaction_id = broadcast_receipt.get(
-                            "trx_id"
-                        )  # Check for 'trx_id' first
-                        if not transaction_id:
-                            transaction_id = broadcast_receipt.get(
-                                "id"
-                            )  # Then check for 'id'
-                        if (
-                            not transaction_id
-                            and "result" in broadcast_receipt
-                            and isinstance(broadcast_receipt["result"], dict)
-                        ):
-                            transaction_id = broadcast_receipt["result"].get(
-                                "id"
-                            )  # Fallback for other structures
+                    logger.debug(
+                        "Attempting to extract transaction_id from receipt: %s",
+                        broadcast_receipt,
+                    )
+                    transaction_id = extract_trx_id(broadcast_receipt)
 
                     if not transaction_id:
-                        logging.error(
+                        logger.error(
                             "Failed to get transaction_id from broadcast receipt. Cannot confirm swap status."
                         )
-                        logging.debug(
-                            f"Full broadcast receipt was: {broadcast_receipt}"
+                        logger.debug(
+                            "Full broadcast receipt was: %s", broadcast_receipt
+                        )
+                    elif args.batched_broadcast:
+                        # The node splits a multi-action custom_json into one
+                        # sub-transaction per payload element with ids
+                        # "<trx_id>-0" (swap) and "<trx_id>-1" (LP deposit);
+                        # the bare broadcast id is not queryable. Confirm both
+                        # halves in one batch polling loop and parse each
+                        # half's own logs for its respective event.
+                        swap_sub_tx_id = f"{transaction_id}-0"
+                        lp_sub_tx_id = f"{transaction_id}-1"
+                        logger.info(
+                            "Batched transaction broadcasted with ID: %s. Confirming sub-transactions %s and %s...",
+                            transaction_id,
+                            swap_sub_tx_id,
+                            lp_sub_tx_id,
                         )
+                        swap_tx_info = None
+                        lp_tx_info = None
+                        try:
+                            confirmed_sub_txs = confirm_hive_engine_transactions(
+                                he_api_client,
+                                [swap_sub_tx_id, lp_sub_tx_id],
+                            )
+                            swap_tx_info = confirmed_sub_txs[swap_sub_tx_id]
+                            lp_tx_info = confirmed_sub_txs[lp_sub_tx_id]
+                        except TransactionConfirmationError as e_batch_confirm:
+                            logger.error(
+                                "Batched TX %s: sub-transaction confirmation failed: %s",
+                                transaction_id,
+                                e_batch_confirm,
+                            )
+                            # The swap half may have confirmed before the
+                            # failure (the confirmation cache answers it
+                            # without re-polling if so); never misreport an
+                            # executed swap as failed.
+                            try:
+                                swap_tx_info = confirm_hive_engine_transaction(
+                                    he_api_client, swap_sub_tx_id
+                                )
+                            except TransactionConfirmationError as e_swap_confirm:
+                                logger.error(
+                                    "Swap sub-transaction %s failed confirmation: %s",
+                                    swap_sub_tx_id,
+                                    e_swap_confirm,
+                                )
+
+                        if swap_tx_info is not None:
+                            swap_logs_str = swap_tx_info["logs"]
+                            swap_had_error, swap_logs_data = _parse_he_logs(
+                                swap_logs_str,
+                                swap_sub_tx_id,
+                                label="Batched swap sub-transaction",
+                            )
+                            if not swap_had_error:
+                                swap_hive_received = _swap_received_from_logs(
+                                    swap_logs_str,
+                                    swap_logs_data,
+                                    swap_sub_tx_id,
+                                    base_currency,
+                                )
+                            if swap_hive_received > ZERO:
+                                target_asset_swapped_successfully = True
+                                # The swap changed the pool reserves; any
+                                # cached pool document is now stale.
+                                invalidate_pool_data(
+                                    token_pair_for_swap_and_price_check
+                                )
+                                logger.info(
+                                    "Swap confirmed for sub-transaction %s. Actual %s received: %.*f.",
+                                    swap_sub_tx_id,
+                                    base_currency,
+                                    base_currency_precision,
+                                    swap_hive_received,
+                                )
+                            else:
+                                logger.error(
+                                    "Swap sub-transaction %s did not yield a confirmed %s transfer. Treating the swap as failed.",
+                                    swap_sub_tx_id,
+                                    base_currency,
+                                )
+
+                        if lp_tx_info is None:
+                            # The batch loop did not deliver the LP half (it
+                            # failed, or confirmation stopped early); probe it
+                            # once so the fallback decision below rests on its
+                            # actual on-chain state.
+                            try:
+                                lp_tx_info = he_api_client.get_transaction_info(
+                                    txid=lp_sub_tx_id
+                                )
+                            except Exception as e_lp_probe:
+                                logger.debug(
+                                    "Could not probe LP sub-transaction %s: %s",
+                                    lp_sub_tx_id,
+                                    e_lp_probe,
+                                )
+                        if lp_tx_info and lp_tx_info.get("logs"):
+                            lp_logs_str = lp_tx_info["logs"]
+                            lp_had_error, lp_logs_data = _parse_he_logs(
+                                lp_logs_str,
+                                lp_sub_tx_id,
+                                label="Batched LP sub-transaction",
+                            )
+                            if not lp_had_error and _find_event(
+                                lp_logs_str, lp_logs_data, _ADD_LIQUIDITY_KEY
+                            ):
+                                lp_deposit_completed_in_batch = True
+                                logger.info(
+                                    "Batched LP deposit confirmed in sub-transaction %s (marketpools.addLiquidity event).",
+                                    lp_sub_tx_id,
+                                )
+                            else:
+                                # Positively failed on chain, so its funds
+                                # were not spent; the separate LP deposit path
+                                # can safely run with actual swap proceeds.
+                                logger.warning(
+                                    "LP sub-transaction %s failed on-chain; falling back to a separate LP deposit.",
+                                    lp_sub_tx_id,
+                                )
+                        elif target_asset_swapped_successfully:
+                            # On-chain state unknown: depositing again could
+                            # double-spend, so block the separate path and
+                            # leave this run for manual review.
+                            lp_deposit_completed_in_batch = True
+                            logger.warning(
+                                "LP sub-transaction %s state is unknown; skipping the separate LP deposit to avoid double-depositing. Review TX %s manually.",
+                                lp_sub_tx_id,
+                                transaction_id,
+                            )
                     else:
-                        logging.info(
-                            f"Swap transaction broadcasted with ID: {transaction_id}. Waiting {HIVE_ENGINE_TX_CONFIRM_DELAY_SECONDS}s for initial HE confirmation..."
+                        logger.info(
+                            "Swap transaction broadcasted with ID: %s. Waiting %ss for initial HE confirmation...",
+                            transaction_id,
+                            HIVE_ENGINE_TX_CONFIRM_DELAY_SECONDS,
                         )
                         # Confirm transaction using local pizza.py function
                         try:
@@ -534,18 +1638,21 @@ def main():  # noqa: C901
                                 he_api_client,  # Pass the nectarengine.Api client instance
                                 transaction_id,
                             )
-                            logging.info(
-                                f"Transaction {transaction_id} confirmed by Hive Engine via local confirm_hive_engine_transaction."
+                            logger.info(
+                                "Transaction %s confirmed by Hive Engine via local confirm_hive_engine_transaction.",
+                                transaction_id,
                             )
                             tx_info = confirmed_tx_info  # Use this for subsequent original parsing logic
                             # target_asset_swapped_successfully will be determined by event parsing in the 'else' block below.
                         except TransactionConfirmationError as e_confirm:
-                            logging.error(
-                                f"Transaction {transaction_id} failed confirmation via local confirm_hive_engine_transaction: {e_confirm}"
+                            logger.error(
+                                "Transaction %s failed confirmation via local confirm_hive_engine_transaction: %s",
+                                transaction_id,
+                                e_confirm,
                             )
                             tx_info = None  # Signal failure to subsequent logic
                             target_asset_swapped_successfully = False
-                            swap_hive_received = Decimal("0")
+                            swap_hive_received = ZERO
 
                         # The original script's 'else:' block (for when tx_info and logs exist)
                         # will now execute if tx_info is not None (i.e., local confirmation was successful).
@@ -553,196 +1660,135 @@ def main():  # noqa: C901
                         # (target_asset_swapped_successfully, swap_hive_received) are already set from the except block.
                         else:
                             he_logs_str = tx_info["logs"]
-                            transaction_had_error = (
-                                False  # Reset for this transaction attempt
+                            transaction_had_error, logs_data = _parse_he_logs(
+                                he_logs_str,
+                                transaction_id,
+                                label="Swap transaction",
                             )
 
-                            # Check for errors in HE logs string
-                            if isinstance(he_logs_str, str) and he_logs_str.strip():
-                                try:
-                                    logs_data = json.loads(he_logs_str)
-                                    if (
-                                        isinstance(logs_data, dict)
-                                        and "errors" in logs_data
-                                        and logs_data["errors"]
-                                    ):
-                                        logging.error(
-                                            f"Swap transaction {transaction_id} failed with errors from HE logs: {logs_data['errors']}"
-                                        )
-                                        transaction_had_error = True
-                                except json.JSONDecodeError:
-                                    logging.warning(
-                                        f"Could not JSON decode HE logs string for error check in {transaction_id}: {he_logs_str}"
-                                    )
-                                    transaction_had_error = (
-                                        True  # Treat as error if logs are unparseable
-                                    )
-                            elif (
-                                he_logs_str is not None
-                            ):  # Logs exist but not a string, or empty string
-                                logging.warning(
-                                    f"HE logs for {transaction_id} are not a non-empty string: '{he_logs_str}'. Cannot parse for errors/events."
-                                )
-                                transaction_had_error = (
-                                    True  # Treat as error if logs are malformed
-                                )
-                            # If he_logs_str is None, it implies no logs/errors, but also no events. Handled by event parsing logic.
-
                             # Initialize/reset before attempting to parse events and determine success
-                            current_swap_actual_hive_received = Decimal("0")
+                            current_swap_actual_hive_received = ZERO
 
                             if not transaction_had_error:
-                                if isinstance(he_logs_str, str):
-                                    try:
-                                        # he_logs_str should contain the JSON string of logs
-                                        logs_data_events = json.loads(he_logs_str)
-                                        if (
-                                            isinstance(logs_data_events, dict)
-                                            and "events" in logs_data_events
-                                        ):
-                                            for event_item in logs_data_events.get(
-                                                "events", []
-                                            ):
-                                                if (
-                                                    event_item.get("contract")
-                                                    == "tokens"
-                                                    and event_item.get("event")
-                                                    == "transferFromContract"
-                                                ):
-                                                    event_data = event_item.get(
-                                                        "data", {}
-                                                    )
-                                                    if (
-                                                        event_data.get("from")
-                                                        == "marketpools"
-                                                        and event_data.get("to")
-                                                        == HIVE_ACCOUNT_NAME
-                                                        and event_data.get("symbol")
-                                                        == args.base_currency
-                                                    ):
-                                                        quantity_received_str = (
-                                                            event_data.get("quantity")
-                                                        )
-                                                        if quantity_received_str:
-                                                            current_swap_actual_hive_received = Decimal(
-                                                                quantity_received_str
-                                                            )
-                                                            logging.info(
-                                                                f"Swap successful! Received {current_swap_actual_hive_received} {args.base_currency} from TX: {transaction_id} (via transferFromContract event)."
-                                                            )
-
-                                                            # Log the fee paid from marketpools.swapTokens event
-                                                            for (
-                                                                fee_event_item
-                                                            ) in logs_data_events.get(
-                                                                "events", []
-                                                            ):
-                                                                if (
-                                                                    fee_event_item.get(
-                                                                        "contract"
-                                                                    )
-                                                                    == "marketpools"
-                                                                    and fee_event_item.get(
-                                                                        "event"
-                                                                    )
-                                                                    == "swapTokens"
-                                                                ):
-                                                                    fee_data = fee_event_item.get(
-                                                                        "data", {}
-                                                                    ).get("fee", {})
-                                                                    fee_amount = (
-                                                                        fee_data.get(
-                                                                            "amount"
-                                                                        )
-                                                                    )
-                                                                    fee_symbol = (
-                                                                        fee_data.get(
-                                                                            "symbol"
-                                                                        )
-                                                                    )
-                                                                    if (
-                                                                        fee_amount
-                                                                        and fee_symbol
-                                                                    ):
-                                                                        logging.info(
-                                                                            f"Swap fee paid: {fee_amount} {fee_symbol} (from marketpools.swapTokens event)."
-                                                                        )
-                                                                    break  # Found fee event
-                                                            break  # Found primary transferFromContract event
-                                    except json.JSONDecodeError:
-                                        logging.warning(
-                                            f"Could not JSON decode HE logs string for event parsing in {transaction_id}: {he_logs_str}"
-                                        )
-                                    except Exception as e_event_parse:
-                                        logging.error(
-                                            f"Error parsing events from HE logs for {transaction_id}: {e_event_parse}"
-                                        )
+                                current_swap_actual_hive_received = (
+                                    _swap_received_from_logs(
+                                        he_logs_str,
+                                        logs_data,
+                                        transaction_id,
+                                        base_currency,
+                                    )
+                                )
 
                                 # Determine overall swap success based on current_swap_actual_hive_received
-                                if current_swap_actual_hive_received > Decimal("0"):
+                                if current_swap_actual_hive_received > ZERO:
                                     target_asset_swapped_successfully = True
                                     swap_hive_received = current_swap_actual_hive_received  # Update the main variable for later use
-                                    logging.info(
-                                        f"Swap confirmed for TX: {transaction_id}. Actual {args.base_currency} for LP deposit: {swap_hive_received:.{base_currency_precision}f}."
+                                    # The swap changed the pool reserves; any
+                                    # cached pool document is now stale.
+                                    invalidate_pool_data(
+                                        token_pair_for_swap_and_price_check
+                                    )
+                                    logger.info(
+                                        "Swap confirmed for TX: %s. Actual %s for LP deposit: %.*f.",
+                                        transaction_id,
+                                        base_currency,
+                                        base_currency_precision,
+                                        swap_hive_received,
                                     )
                                 else:
                                     # This case: no transaction_had_error, but no valid transferFromContract event found or amount was zero.
                                     target_asset_swapped_successfully = False
-                                    swap_hive_received = Decimal(
-                                        "0"
-                                    )  # Ensure it's zero for safety for subsequent LP deposit logic
-                                    logging.error(
-                                        f"Swap TX: {transaction_id} had no errors, but required confirmation event (transferFromContract for {args.base_currency} from marketpools) not found or amount was zero. Cannot confirm {args.base_currency} received."
+                                    swap_hive_received = ZERO  # Ensure it's zero for safety for subsequent LP deposit logic
+                                    logger.error(
+                                        "Swap TX: %s had no errors, but required confirmation event (transferFromContract for %s from marketpools) not found or amount was zero. Cannot confirm %s received.",
+                                        transaction_id,
+                                        base_currency,
+                                        base_currency,
                                     )
                             else:  # transaction_had_error was True
                                 target_asset_swapped_successfully = False
-                                swap_hive_received = Decimal("0")  # Ensure it's zero
-                                logging.error(
-                                    f"Swap TX: {transaction_id} failed due to errors reported in HE logs. {args.base_currency} received set to 0."
+                                swap_hive_received = ZERO  # Ensure it's zero
+                                logger.error(
+                                    "Swap TX: %s failed due to errors reported in HE logs. %s received set to 0.",
+                                    transaction_id,
+                                    base_currency,
                                 )
                 except Exception:
-                    logging.exception(
+                    logger.exception(
                         "Error during swapTokens broadcast or confirmation process:"
                     )
                     target_asset_swapped_successfully = False
             else:
                 swap_hive_received = expected_swap_hive_out.quantize(
-                    Decimal(f"1e-{base_currency_precision}"), ROUND_DOWN
+                    _quantizer(base_currency_precision), ROUND_DOWN
                 )
-                logging.warning(
-                    f"[DRY RUN] Would swap {sim_to_swap_str} {args.target_asset} for an estimated {swap_hive_received:.{base_currency_precision}f} {args.base_currency} (min out: {min_amount_out_str} {args.base_currency})."
+                logger.warning(
+                    "[DRY RUN] Would swap %s %s for an estimated %.*f %s (min out: %s %s).",
+                    sim_to_swap_str,
+                    target_asset,
+                    base_currency_precision,
+                    swap_hive_received,
+                    base_currency,
+                    min_amount_out_str,
+                    base_currency,
                 )
-                logging.info(
-                    f"[DRY RUN] Swap payload would be: contract='marketpools', action='swapTokens', payload={{'tokenPair': '{token_pair_for_swap_and_price_check}', 'tokenSymbol': '{args.target_asset}', 'tokenQuantity': '{sim_to_swap_str}', 'minAmountOut': '{min_amount_out_str}'}}"
+                logger.info(
+                    "[DRY RUN] Swap payload would be: contract='marketpools', action='swapTokens', payload={'tokenPair': '%s', 'tokenSymbol': '%s', 'tokenQuantity': '%s', 'minAmountOut': '%s'}",
+                    token_pair_for_swap_and_price_check,
+                    target_asset,
+                    sim_to_swap_str,
+                    min_amount_out_str,
                 )
                 target_asset_swapped_successfully = (
                     True  # Assume success for dry run to test next step
                 )
 
             if target_asset_swapped_successfully:
-                logging.info(
-                    f"Estimated {swap_hive_received:.{base_currency_precision}f} {args.base_currency} to be received from swap operation."
+                logger.info(
+                    "Estimated %.*f %s to be received from swap operation.",
+                    base_currency_precision,
+                    swap_hive_received,
+                    base_currency,
                 )
             else:
-                logging.error(
-                    f"Swap operation for {args.target_asset} was not successful or resulted in zero {args.base_currency}. Skipping LP deposit."
+                logger.error(
+                    "Swap operation for %s was not successful or resulted in zero %s. Skipping LP deposit.",
+                    target_asset,
+                    base_currency,
                 )
 
         else:
-            logging.info(
-                f"Pool price ({current_pool_price:.{target_asset_precision + 2}f}) is not above threshold ({price_threshold:.{base_currency_precision}f}). No swap action taken."
+            logger.info(
+                "Pool price (%.*f) is not above threshold (%.*f). No swap action taken.",
+                target_asset_precision + 2,
+                current_pool_price,
+                base_currency_precision,
+                price_threshold,
             )
 
         # --- 2. Add to Liquidity Pool (if TARGET_ASSET was swapped successfully) ---
-        if target_asset_swapped_successfully and swap_hive_received > Decimal(0):
-            logging.info(
-                f"Proceeding to add liquidity with {swap_hive_received:.{base_currency_precision}f} {args.base_currency}."
+        if lp_deposit_completed_in_batch:
+            logger.info(
+                "LP deposit already completed in the batched broadcast; skipping separate deposit."
+            )
+        elif target_asset_swapped_successfully and swap_hive_received > ZERO:
+            logger.info(
+                "Proceeding to add liquidity with %.*f %s.",
+                base_currency_precision,
+                swap_hive_received,
+                base_currency,
             )
             # The token_pair_lp for adding liquidity should be the same as used for the swap, or as desired.
             token_pair_lp_deposit = token_pair_for_swap_and_price_check
 
-            swap_hive_to_deposit_for_lp = swap_hive_received
-            swap_hive_lp_amount_str = format_amount(
+            # Quantize once and keep the Decimal; the string form is only for
+            # log output. Re-parsing the formatted string back into Decimal
+            # paid the string constructor for a value we already had.
+            swap_hive_to_deposit_for_lp = swap_hive_received.quantize(
+                _quantizer(base_currency_precision), ROUND_DOWN
+            )
+            # Log-only rendering; the broadcast itself takes the Decimals.
+            swap_hive_lp_amount_str = _LazyAmount(
                 swap_hive_to_deposit_for_lp, base_currency_precision
             )
 
@@ -750,107 +1796,138 @@ def main():  # noqa: C901
             price_for_lp_logging = None  # For the logging statement that follows
             can_add_liquidity = False  # Flag to control if we proceed to actual deposit
 
-            logging.info(
-                f"Fetching full pool details for {token_pair_lp_deposit} to calculate exact deposit ratio..."
-            )
             actual_pool_data = None
+            if args.dry_run:
+                # No broadcast will fire, so don't spend an RPC on the pool
+                # document: the deposit ratio only needs quotePrice, which the
+                # startup price check already fetched. The reserve fields are
+                # placeholders that satisfy the shared validation below.
+                actual_pool_data = {
+                    "baseQuantity": "1",
+                    "quoteQuantity": "1",
+                    "quotePrice": str(current_pool_price),
+                }
+                logger.info(
+                    "[DRY RUN] Using cached pool price for %s instead of refetching pool details.",
+                    token_pair_lp_deposit,
+                )
+            else:
+                logger.info(
+                    "Fetching full pool details for %s to calculate exact deposit ratio...",
+                    token_pair_lp_deposit,
+                )
             try:
-                # Pool.__init__ raises PoolDoesNotExist if the pool is not found.
-                # Otherwise, pool_obj is the dictionary with pool data.
-                # Ensure he_api_client is passed to the Pool constructor.
-                pool_obj = Pool(token_pair_lp_deposit, api=he_api_client)
-                actual_pool_data = dict(pool_obj)  # Get the data from the Pool object
-                logging.debug(f"Fetched pool details: {actual_pool_data}")
+                # get_pool_data raises PoolDoesNotExist (via Pool) if the pool
+                # is not found; repeat reads within the TTL reuse the cached
+                # document instead of refetching the reserves.
+                if actual_pool_data is None:
+                    actual_pool_data = get_pool_data(
+                        token_pair_lp_deposit, he_api_client
+                    )
+                    logger.debug("Fetched pool details: %s", actual_pool_data)
             except PoolDoesNotExist:
-                logging.warning(
-                    f"Pool {token_pair_lp_deposit} does not exist. Cannot calculate deposit ratio."
+                logger.warning(
+                    "Pool %s does not exist. Cannot calculate deposit ratio.",
+                    token_pair_lp_deposit,
                 )
                 # actual_pool_data remains None
             except (
                 Exception
             ) as e_unexpected_pool_fetch:  # Catch other unexpected errors
-                logging.error(
-                    f"Unexpected error fetching/processing pool details for {token_pair_lp_deposit}: {e_unexpected_pool_fetch}"
+                logger.error(
+                    "Unexpected error fetching/processing pool details for %s: %s",
+                    token_pair_lp_deposit,
+                    e_unexpected_pool_fetch,
                 )
                 # actual_pool_data remains None
 
             if not actual_pool_data:
                 # Error already logged by the try/except block or if pool_obj.info was empty.
                 # The original script's logic will skip the deposit if actual_pool_data is None.
-                logging.info(
-                    f"Aborting LP deposit for {token_pair_lp_deposit} due to missing pool data after attempt."
+                logger.info(
+                    "Aborting LP deposit for %s due to missing pool data after attempt.",
+                    token_pair_lp_deposit,
                 )
                 pass
             else:
-                pool_base_quantity_str = actual_pool_data.get(
-                    "baseQuantity"
-                )  # SWAP.HIVE reserves
-                pool_quote_quantity_str = actual_pool_data.get(
-                    "quoteQuantity"
-                )  # TARGET_ASSET reserves
-                price_str_from_pool_obj = actual_pool_data.get(
-                    "quotePrice"
-                )  # BASE_CURRENCY per TARGET_ASSET, for logging
-
-                if (
-                    not pool_base_quantity_str
-                    or not pool_quote_quantity_str
-                    or not price_str_from_pool_obj
-                ):
-                    logging.error(
-                        f"Pool details for {token_pair_lp_deposit} are incomplete (missing base/quote quantity or price). Pool: {actual_pool_data}. Aborting LP deposit."
+                # One pass over the pool document: pull and convert the three
+                # fields the ratio math needs (base reserves / quote reserves
+                # as SWAP.HIVE and TARGET_ASSET, and quotePrice for logging).
+                try:
+                    pool_base_reserve, pool_quote_reserve, price_for_lp_logging = (
+                        Decimal(actual_pool_data[key])
+                        for key in ("baseQuantity", "quoteQuantity", "quotePrice")
                     )
+                except (KeyError, TypeError, ValueError, InvalidOperation) as e_fields:
+                    pool_base_reserve = None
+                    logger.error(
+                        "Pool details for %s are incomplete or not numeric (%s). Pool: %s. Aborting LP deposit.",
+                        token_pair_lp_deposit,
+                        e_fields,
+                        actual_pool_data,
+                    )
+
+                if pool_base_reserve is None:
+                    pass  # Error already logged above
                 else:
                     try:
-                        pool_base_reserve = Decimal(pool_base_quantity_str)
-                        pool_quote_reserve = Decimal(pool_quote_quantity_str)
-                        price_for_lp_logging = Decimal(price_str_from_pool_obj)
-
-                        if pool_base_reserve <= Decimal(0):
-                            logging.error(
-                                f"Pool {token_pair_lp_deposit} has zero or negative base quantity ({pool_base_reserve} {args.base_currency}). Cannot calculate deposit ratio. Aborting LP deposit."
+                        if pool_base_reserve <= ZERO:
+                            logger.error(
+                                "Pool %s has zero or negative base quantity (%s %s). Cannot calculate deposit ratio. Aborting LP deposit.",
+                                token_pair_lp_deposit,
+                                pool_base_reserve,
+                                base_currency,
                             )
-                        elif pool_quote_reserve < Decimal(
-                            0
+                        elif (
+                            pool_quote_reserve < ZERO
                         ):  # Quote can be zero (e.g. new pool) but not negative
-                            logging.error(
-                                f"Pool {token_pair_lp_deposit} has negative quote quantity ({pool_quote_reserve} {args.target_asset}). Cannot calculate deposit ratio. Aborting LP deposit."
+                            logger.error(
+                                "Pool %s has negative quote quantity (%s %s). Cannot calculate deposit ratio. Aborting LP deposit.",
+                                token_pair_lp_deposit,
+                                pool_quote_reserve,
+                                target_asset,
                             )
                         else:
-                            # We are depositing swap_hive_to_deposit_for_lp (args.base_currency - base token of the pair)
-                            # Calculate required args.target_asset (quote token of the pair) based on current reserve ratio
-                            # quote_to_add = base_to_add * (quote_reserve / base_reserve)
-                            # Use the actual SWAP.HIVE amount that will be in the transaction string for ratio calculation
-                            actual_swap_hive_for_ratio_calc = Decimal(
-                                swap_hive_lp_amount_str
-                            )
-                            sim_to_deposit_ideal = actual_swap_hive_for_ratio_calc * (
-                                pool_quote_reserve / pool_base_reserve
+                            # We are depositing swap_hive_to_deposit_for_lp (base_currency - base token of the pair)
+                            # Calculate required target_asset (quote token of the pair) based on current reserve ratio.
+                            # quotePrice = base_reserve / quote_reserve, so
+                            # quote_to_add = base_to_add / quotePrice — one
+                            # Decimal division instead of a divide + multiply
+                            # over the raw reserves.
+                            # swap_hive_to_deposit_for_lp is already quantized
+                            # to the amount that goes into the transaction.
+                            sim_to_deposit_ideal = (
+                                swap_hive_to_deposit_for_lp / price_for_lp_logging
                             )
                             sim_to_deposit_quantized = sim_to_deposit_ideal.quantize(
-                                Decimal(f"1e-{target_asset_precision}"), ROUND_DOWN
+                                _quantizer(target_asset_precision), ROUND_DOWN
                             )
-                            target_asset_lp_amount_str_adjusted = format_amount(
+                            target_asset_lp_amount_str_adjusted = _LazyAmount(
                                 sim_to_deposit_quantized, target_asset_precision
                             )
                             can_add_liquidity = True  # Calculation successful
-                            logging.info(
-                                f"Calculated {args.target_asset} to deposit based on reserves: {target_asset_lp_amount_str_adjusted} {args.target_asset} for {swap_hive_lp_amount_str} {args.base_currency}"
+                            logger.info(
+                                "Calculated %s to deposit based on reserves: %s %s for %s %s",
+                                target_asset,
+                                target_asset_lp_amount_str_adjusted,
+                                target_asset,
+                                swap_hive_lp_amount_str,
+                                base_currency,
                             )
 
                     except (
                         ZeroDivisionError
                     ):  # Should be caught by pool_base_reserve <= 0, but as safeguard
-                        logging.error(
-                            f"Division by zero error calculating LP deposit amounts for {token_pair_lp_deposit} (base reserve likely zero). Pool details: {actual_pool_data}"
-                        )
-                    except (TypeError, ValueError) as e:
-                        logging.error(
-                            f"Error converting pool reserve or price to Decimal for {token_pair_lp_deposit}. Details: {actual_pool_data}. Error: {e}. Aborting LP deposit."
+                        logger.error(
+                            "Division by zero error calculating LP deposit amounts for %s (base reserve likely zero). Pool details: %s",
+                            token_pair_lp_deposit,
+                            actual_pool_data,
                         )
                     except Exception as e_calc:
-                        logging.error(
-                            f"Unexpected error calculating deposit amounts from pool reserves for {token_pair_lp_deposit}. Error: {e_calc}. Aborting LP deposit."
+                        logger.error(
+                            "Unexpected error calculating deposit amounts from pool reserves for %s. Error: %s. Aborting LP deposit.",
+                            token_pair_lp_deposit,
+                            e_calc,
                         )
 
             if (
@@ -858,74 +1935,127 @@ def main():  # noqa: C901
                 and target_asset_lp_amount_str_adjusted is not None
                 and swap_hive_lp_amount_str is not None
             ):
-                logging.info(
-                    f"Adjusting LP deposit for {token_pair_lp_deposit} based on pool price ({price_for_lp_logging:.{target_asset_precision + 2}f} {args.base_currency}/{args.target_asset}):"
-                )
-                logging.info(
-                    f"  {args.target_asset} (Quote): {target_asset_lp_amount_str_adjusted}"
+                logger.info(
+                    "Adjusting LP deposit for %s based on pool price (%.*f %s/%s):",
+                    token_pair_lp_deposit,
+                    target_asset_precision + 2,
+                    price_for_lp_logging,
+                    base_currency,
+                    target_asset,
                 )
-                logging.info(
-                    f"  {args.base_currency} (Base): {swap_hive_lp_amount_str}"
+                logger.info(
+                    "  %s (Quote): %s",
+                    target_asset,
+                    target_asset_lp_amount_str_adjusted,
                 )
+                logger.info("  %s (Base): %s", base_currency, swap_hive_lp_amount_str)
 
                 # Check balances before attempting to add liquidity
                 sufficient_funds_for_lp = False
-                try:
-                    wallet = Wallet(account_name, api=he_api_client)
-                    base_token_to_deposit = Decimal(swap_hive_lp_amount_str)
-                    _token_data_base_lp = wallet.get_token(args.base_currency)
-                    if _token_data_base_lp and "balance" in _token_data_base_lp:
-                        current_base_balance = Decimal(_token_data_base_lp["balance"])
-                    else:
-                        current_base_balance = Decimal("0")
-                        logging.warning(
-                            f"{args.base_currency} not found in wallet for {account_name} or balance data missing during LP check. Assuming 0 balance."
-                        )
-                    logging.info(
-                        f"Current {args.base_currency} balance for LP: {current_base_balance}"
+                if args.dry_run:
+                    # Simulation only: skip the wallet RPCs and assume funds
+                    # so the dry-run output shows the would-be deposit.
+                    sufficient_funds_for_lp = True
+                    logger.info(
+                        "[DRY RUN] Skipping wallet balance check for LP deposit."
                     )
-
-                    if current_base_balance < base_token_to_deposit:
-                        logging.error(
-                            f"Insufficient {args.base_currency} balance for LP. Have: {current_base_balance}, Need: {base_token_to_deposit}"
-                        )
-                        # Optionally, raise InsufficientTokenAmount or just let sufficient_funds_for_lp stay False
-                    else:
-                        # Check args.target_asset balance only if base balance is sufficient
-                        quote_token_to_deposit = sim_to_deposit_quantized
-                        _token_data_quote_lp = wallet.get_token(args.target_asset)
-                        if _token_data_quote_lp and "balance" in _token_data_quote_lp:
-                            current_quote_balance = Decimal(
-                                _token_data_quote_lp["balance"]
+                else:
+                    try:
+                        wallet = get_wallet(account_name, he_api_client)
+                        try:
+                            # Balances changed if the swap broadcast; re-fetch the
+                            # cached wallet's state before checking them.
+                            wallet.refresh()
+                        except Exception as e_refresh:
+                            logger.warning(
+                                "Could not refresh wallet state for %s: %s",
+                                account_name,
+                                e_refresh,
+                            )
+                        base_token_to_deposit = swap_hive_to_deposit_for_lp
+                        # Index the wallet entries once instead of two get_token
+                        # scans; the refresh above already fetched every balance
+                        # in a single query.
+                        wallet_tokens = {
+                            entry.get("symbol"): entry
+                            for entry in wallet
+                            if isinstance(entry, dict)
+                        }
+                        _token_data_base_lp = wallet_tokens.get(base_currency)
+                        if _token_data_base_lp and "balance" in _token_data_base_lp:
+                            current_base_balance = Decimal(
+                                _token_data_base_lp["balance"]
                             )
                         else:
-                            current_quote_balance = Decimal("0")
-                            logging.warning(
-                                f"{args.target_asset} not found in wallet for {account_name} or balance data missing during LP check. Assuming 0 balance."
+                            current_base_balance = ZERO
+                            logger.warning(
+                                "%s not found in wallet for %s or balance data missing during LP check. Assuming 0 balance.",
+                                base_currency,
+                                account_name,
                             )
-                        logging.info(
-                            f"Current {args.target_asset} balance for LP: {current_quote_balance}"
+                        logger.info(
+                            "Current %s balance for LP: %s",
+                            base_currency,
+                            current_base_balance,
                         )
 
-                        if current_quote_balance < quote_token_to_deposit:
-                            logging.error(
-                                f"Insufficient {args.target_asset} balance for LP. Have: {current_quote_balance}, Need: {quote_token_to_deposit}"
+                        if current_base_balance < base_token_to_deposit:
+                            logger.error(
+                                "Insufficient %s balance for LP. Have: %s, Need: %s",
+                                base_currency,
+                                current_base_balance,
+                                base_token_to_deposit,
                             )
+                            # Optionally, raise InsufficientTokenAmount or just let sufficient_funds_for_lp stay False
                         else:
-                            sufficient_funds_for_lp = True
+                            # Check target_asset balance only if base balance is sufficient
+                            quote_token_to_deposit = sim_to_deposit_quantized
+                            _token_data_quote_lp = wallet_tokens.get(target_asset)
+                            if (
+                                _token_data_quote_lp
+                                and "balance" in _token_data_quote_lp
+                            ):
+                                current_quote_balance = Decimal(
+                                    _token_data_quote_lp["balance"]
+                                )
+                            else:
+                                current_quote_balance = ZERO
+                                logger.warning(
+                                    "%s not found in wallet for %s or balance data missing during LP check. Assuming 0 balance.",
+                                    target_asset,
+                                    account_name,
+                                )
+                            logger.info(
+                                "Current %s balance for LP: %s",
+                                target_asset,
+                                current_quote_balance,
+                            )
 
-                except TokenNotInWallet as e_tnw:
-                    logging.error(
-                        f"Token not in wallet for LP deposit: {e_tnw}. Aborting LP deposit."
-                    )
-                except InsufficientTokenAmount as e_ita:  # This custom exception might not be raised by get_token_balance directly
-                    logging.warning(
-                        f"LP deposit aborted due to insufficient funds reported: {e_ita}"
-                    )
-                except Exception as e_lp_wallet_check:
-                    logging.error(
-                        f"Error checking token balances for LP deposit: {e_lp_wallet_check}. Aborting LP deposit."
-                    )
+                            if current_quote_balance < quote_token_to_deposit:
+                                logger.error(
+                                    "Insufficient %s balance for LP. Have: %s, Need: %s",
+                                    target_asset,
+                                    current_quote_balance,
+                                    quote_token_to_deposit,
+                                )
+                            else:
+                                sufficient_funds_for_lp = True
+
+                    except TokenNotInWallet as e_tnw:
+                        logger.error(
+                            "Token not in wallet for LP deposit: %s. Aborting LP deposit.",
+                            e_tnw,
+                        )
+                    except InsufficientTokenAmount as e_ita:  # This custom exception might not be raised by get_token_balance directly
+                        logger.warning(
+                            "LP deposit aborted due to insufficient funds reported: %s",
+                            e_ita,
+                        )
+                    except Exception as e_lp_wallet_check:
+                        logger.error(
+                            "Error checking token balances for LP deposit: %s. Aborting LP deposit.",
+                            e_lp_wallet_check,
+                        )
 
                 if sufficient_funds_for_lp:
                     if (
@@ -935,8 +2065,13 @@ def main():  # noqa: C901
                         lp_transaction_id = None
                         lp_deposit_confirmed_successful = False
                         try:
-                            logging.info(
-                                f"Attempting to add liquidity for {token_pair_lp_deposit} with {swap_hive_lp_amount_str} {args.base_currency} and {target_asset_lp_amount_str_adjusted} {args.target_asset}."
+                            logger.info(
+                                "Attempting to add liquidity for %s with %s %s and %s %s.",
+                                token_pair_lp_deposit,
+                                swap_hive_lp_amount_str,
+                                base_currency,
+                                target_asset_lp_amount_str_adjusted,
+                                target_asset,
                             )
                             tx_lp_receipt = lp_handler.add_liquidity(
                                 account=account_name,
@@ -944,14 +2079,17 @@ def main():  # noqa: C901
                                 base_quantity=swap_hive_to_deposit_for_lp,  # nectarengine handles Decimal to str
                                 quote_quantity=sim_to_deposit_quantized,  # nectarengine handles Decimal to str
                             )
-                            logging.info(
-                                f"lp_handler.add_liquidity broadcast receipt: {tx_lp_receipt}"
+                            logger.info(
+                                "lp_handler.add_liquidity broadcast receipt: %s",
+                                tx_lp_receipt,
                             )
 
-                            if tx_lp_receipt and "trx_id" in tx_lp_receipt:
-                                lp_transaction_id = tx_lp_receipt["trx_id"]
-                                logging.info(
-                                    f"Liquidity deposit transaction broadcasted with ID: {lp_transaction_id}. Waiting {HIVE_ENGINE_TX_CONFIRM_DELAY_SECONDS}s for initial HE confirmation..."
+                            lp_transaction_id = extract_trx_id(tx_lp_receipt)
+                            if lp_transaction_id:
+                                logger.info(
+                                    "Liquidity deposit transaction broadcasted with ID: %s. Waiting %ss for initial HE confirmation...",
+                                    lp_transaction_id,
+                                    HIVE_ENGINE_TX_CONFIRM_DELAY_SECONDS,
                                 )
                                 # Confirm LP transaction using local pizza.py function
                                 try:
@@ -960,13 +2098,16 @@ def main():  # noqa: C901
                                         he_api_client,  # Pass the nectarengine.Api client instance
                                         lp_transaction_id,
                                     )
-                                    logging.info(
-                                        f"LP Transaction {lp_transaction_id} confirmed by Hive Engine via local confirm_hive_engine_transaction."
+                                    logger.info(
+                                        "LP Transaction %s confirmed by Hive Engine via local confirm_hive_engine_transaction.",
+                                        lp_transaction_id,
                                     )
                                     lp_tx_info = confirmed_lp_tx_info
                                 except TransactionConfirmationError as e_confirm_lp:
-                                    logging.error(
-                                        f"LP Transaction {lp_transaction_id} failed confirmation via local confirm_hive_engine_transaction: {e_confirm_lp}"
+                                    logger.error(
+                                        "LP Transaction %s failed confirmation via local confirm_hive_engine_transaction: %s",
+                                        lp_transaction_id,
+                                        e_confirm_lp,
                                     )
                                     lp_tx_info = None  # Signal failure
 
@@ -974,130 +2115,99 @@ def main():  # noqa: C901
                                 # will now execute if lp_tx_info is not None.
                                 else:
                                     lp_he_logs_str = lp_tx_info["logs"]
-                                    lp_transaction_had_error = False
-
-                                    if (
-                                        isinstance(lp_he_logs_str, str)
-                                        and lp_he_logs_str.strip()
-                                    ):
-                                        try:
-                                            lp_logs_data = json.loads(lp_he_logs_str)
-                                            if (
-                                                isinstance(lp_logs_data, dict)
-                                                and "errors" in lp_logs_data
-                                                and lp_logs_data["errors"]
-                                            ):
-                                                logging.error(
-                                                    f"LP deposit transaction {lp_transaction_id} failed with errors from HE logs: {lp_logs_data['errors']}"
-                                                )
-                                                lp_transaction_had_error = True
-                                        except json.JSONDecodeError:
-                                            logging.warning(
-                                                f"Could not JSON decode HE logs string for LP deposit {lp_transaction_id}: {lp_he_logs_str}"
-                                            )
-                                            lp_transaction_had_error = True
-                                    elif (
-                                        lp_he_logs_str is not None
-                                    ):  # Logs exist but not a string, or empty string
-                                        logging.warning(
-                                            f"HE logs for LP deposit {lp_transaction_id} are not a non-empty string: '{lp_he_logs_str}'. Cannot parse for errors/events."
+                                    lp_transaction_had_error, lp_logs_data = (
+                                        _parse_he_logs(
+                                            lp_he_logs_str,
+                                            lp_transaction_id,
+                                            label="LP deposit transaction",
                                         )
-                                        lp_transaction_had_error = True
-                                    # If lp_he_logs_str is None, implies no logs/errors, but also no events.
+                                    )
 
                                     if not lp_transaction_had_error:
-                                        if (
-                                            isinstance(lp_he_logs_str, str)
-                                            and lp_he_logs_str.strip()
-                                        ):  # Re-check for safety before parsing events
-                                            try:
-                                                lp_logs_data_events = json.loads(
-                                                    lp_he_logs_str
-                                                )
-                                                if (
-                                                    isinstance(
-                                                        lp_logs_data_events, dict
-                                                    )
-                                                    and "events" in lp_logs_data_events
-                                                ):
-                                                    for (
-                                                        event_item
-                                                    ) in lp_logs_data_events.get(
-                                                        "events", []
-                                                    ):
-                                                        if (
-                                                            event_item.get("contract")
-                                                            == "marketpools"
-                                                            and event_item.get("event")
-                                                            == "addLiquidity"
-                                                        ):
-                                                            event_data = event_item.get(
-                                                                "data", {}
-                                                            )
-                                                            # For addLiquidity, the event itself is confirmation. Specific amounts can be logged if needed.
-                                                            logging.info(
-                                                                f"Liquidity successfully added for TX: {lp_transaction_id}. Event data: {event_data}"
-                                                            )
-                                                            lp_deposit_confirmed_successful = True
-                                                            break  # Found addLiquidity event
-                                                    if not lp_deposit_confirmed_successful:
-                                                        logging.error(
-                                                            f"LP deposit TX {lp_transaction_id} had no errors, but 'marketpools.addLiquidity' event not found in logs. Logs: {lp_he_logs_str}"
-                                                        )
-                                                else:
-                                                    logging.error(
-                                                        f"LP deposit TX {lp_transaction_id} logs do not contain 'events' array or are not a dict. Logs: {lp_he_logs_str}"
-                                                    )
-                                            except json.JSONDecodeError:
-                                                logging.warning(
-                                                    f"Could not JSON decode HE logs string for LP event parsing in {lp_transaction_id}: {lp_he_logs_str}"
+                                        try:
+                                            lp_event = _find_event(
+                                                lp_he_logs_str,
+                                                lp_logs_data,
+                                                _ADD_LIQUIDITY_KEY,
+                                            )
+                                            if lp_event is not None:
+                                                event_data = lp_event.get("data", {})
+                                                # For addLiquidity, the event itself is confirmation. Specific amounts can be logged if needed.
+                                                logger.info(
+                                                    "Liquidity successfully added for TX: %s. Event data: %s",
+                                                    lp_transaction_id,
+                                                    event_data,
                                                 )
-                                            except Exception as e_lp_event_parse:
-                                                logging.error(
-                                                    f"Error parsing events from HE logs for LP deposit {lp_transaction_id}: {e_lp_event_parse}"
+                                                lp_deposit_confirmed_successful = True
+                                            else:
+                                                logger.error(
+                                                    "LP deposit TX %s had no errors, but 'marketpools.addLiquidity' event not found in logs. Logs: %s",
+                                                    lp_transaction_id,
+                                                    lp_he_logs_str,
                                                 )
-                                        else:
-                                            # No HE logs string or empty, but no error reported earlier. This means no events either.
-                                            logging.error(
-                                                f"LP deposit TX {lp_transaction_id} had no errors, but HE logs string was empty or None. Cannot confirm 'marketpools.addLiquidity' event."
+                                        except Exception as e_lp_event_parse:
+                                            logger.error(
+                                                "Error parsing events from HE logs for LP deposit %s: %s",
+                                                lp_transaction_id,
+                                                e_lp_event_parse,
                                             )
-                                    # else: lp_transaction_had_error was True, error already loggedpt: {tx_lp_receipt}")
+                                    # else: lp_transaction_had_error was True, error already logged
                         except Exception as e_broadcast_lp:
-                            logging.exception(
-                                f"Error broadcasting addLiquidity for {token_pair_lp_deposit}: {e_broadcast_lp}"
+                            logger.exception(
+                                "Error broadcasting addLiquidity for %s: %s",
+                                token_pair_lp_deposit,
+                                e_broadcast_lp,
                             )
 
                         if lp_deposit_confirmed_successful:
-                            logging.info(
-                                f"Liquidity successfully added to {token_pair_lp_deposit} (TX: {lp_transaction_id})."
+                            logger.info(
+                                "Liquidity successfully added to %s (TX: %s).",
+                                token_pair_lp_deposit,
+                                lp_transaction_id,
                             )
                         else:
-                            logging.error(
-                                f"Failed to confirm successful liquidity deposit to {token_pair_lp_deposit}. Review logs for TX ID {lp_transaction_id if lp_transaction_id else 'N/A'}."
+                            logger.error(
+                                "Failed to confirm successful liquidity deposit to %s. Review logs for TX ID %s.",
+                                token_pair_lp_deposit,
+                                lp_transaction_id if lp_transaction_id else "N/A",
                             )
                     else:
-                        logging.warning(
-                            f"[DRY RUN] Would add {target_asset_lp_amount_str_adjusted} {args.target_asset} and {swap_hive_lp_amount_str} {args.base_currency} to LP {token_pair_lp_deposit}."
+                        logger.warning(
+                            "[DRY RUN] Would add %s %s and %s %s to LP %s.",
+                            target_asset_lp_amount_str_adjusted,
+                            target_asset,
+                            swap_hive_lp_amount_str,
+                            base_currency,
+                            token_pair_lp_deposit,
                         )
             else:
-                logging.info(
-                    f"Skipping LP deposit for {token_pair_lp_deposit} because amounts could not be calculated/validated, or one of the amounts is zero/None ({args.target_asset}: {target_asset_lp_amount_str_adjusted}, {args.base_currency}: {swap_hive_lp_amount_str})."
+                logger.info(
+                    "LP deposit skipped: reason=%s detail=%s (%s; %s: %s, %s: %s)",
+                    "AMOUNTS_INVALID",
+                    _LP_SKIP_DETAILS["AMOUNTS_INVALID"],
+                    token_pair_lp_deposit,
+                    target_asset,
+                    target_asset_lp_amount_str_adjusted,
+                    base_currency,
+                    swap_hive_lp_amount_str,
                 )
-        elif target_asset_swapped_successfully and swap_hive_received <= Decimal(0):
-            logging.info(
-                f"Swap was marked successful, but {args.base_currency} received is zero. Skipping LP deposit."
-            )
         else:
-            logging.info(
-                f"{args.target_asset} was not swapped, or swap was not successful. Skipping LP deposit."
+            swapped = bool(target_asset_swapped_successfully)
+            reason = _classify_skip(swapped, swap_hive_received > ZERO, False)
+            logger.info(
+                "LP deposit skipped: reason=%s detail=%s (%s)",
+                reason,
+                _LP_SKIP_DETAILS[reason],
+                base_currency if swapped else target_asset,
             )
 
-        logging.info("Operations completed.")
+        logger.info("Operations completed.")
 
     except Exception as e:
-        logging.exception(
-            f"An unexpected error occurred in main: {e}"
-        )  # Changed to logging.exception for full traceback
+        # Formatting the traceback walks the stack and reads source lines;
+        # skip all of it when ERROR records would be dropped anyway.
+        if logger.isEnabledFor(logging.ERROR):
+            logger.exception("An unexpected error occurred in main: %s", e)
         return 1
 
     return 0
@@ -1105,8 +2215,16 @@ def main():  # noqa: C901
 
 if __name__ == "__main__":
     exit_code = main()
-    if exit_code == 0:
-        logging.info("Script finished successfully.")
-    else:
-        logging.error(f"Script finished with error code {exit_code}.")
-    sys.exit(exit_code)  # Ensure cron gets an exit code
+    # Pick the summary level and template by indexing on the error predicate
+    # instead of branching on it. Both templates consume the %d so the
+    # positional argument is always valid.
+    log_summary, summary_template = (
+        (logger.info, "Script finished successfully (exit code %d)."),
+        (logger.error, "Script finished with error code %d."),
+    )[exit_code != 0]
+    log_summary(summary_template, exit_code)
+    logging.shutdown()  # Drain the memory-buffered log records in one burst
+    # With the logs flushed there is nothing left worth tearing down, so skip
+    # interpreter finalization -- notably joining the RPC executor's worker
+    # threads -- and hand cron the exit code directly.
+    os._exit(exit_code)
@@ -0,0 +1,62 @@
+"""Parity tests for the integer fixed-point swap sizing in liquidityBot."""
+
+from decimal import ROUND_DOWN, Decimal
+
+import pytest
+
+liquidity_bot = pytest.importorskip("liquidityBot")
+
+
+def _decimal_reference(
+    amount_to_trade: Decimal,
+    pool_price: Decimal,
+    target_asset_precision: int,
+    base_currency_precision: int,
+    slippage_tolerance: Decimal,
+) -> tuple[Decimal, Decimal]:
+    """Compute (expected_out, min_amount_out) with plain Decimal arithmetic."""
+    target_quantizer = Decimal(1).scaleb(-target_asset_precision)
+    base_quantizer = Decimal(1).scaleb(-base_currency_precision)
+    amount = amount_to_trade.quantize(target_quantizer, rounding=ROUND_DOWN)
+    price = pool_price.quantize(base_quantizer, rounding=ROUND_DOWN)
+    expected_out = (amount * price).quantize(base_quantizer, rounding=ROUND_DOWN)
+    min_amount_out = (expected_out * (1 - slippage_tolerance)).quantize(
+        base_quantizer, rounding=ROUND_DOWN
+    )
+    return expected_out, min_amount_out
+
+
+@pytest.mark.parametrize(
+    ("amount", "price", "target_precision", "base_precision", "slippage"),
+    [
+        ("50", "0.047", 8, 8, "0.01"),
+        ("100", "0.05", 3, 3, "0.01"),
+        ("123.45678901", "0.04699999", 8, 8, "0.005"),
+        ("1", "0.00000001", 8, 8, "0.05"),
+        ("7", "3.141", 0, 8, "0.0123"),
+        ("0.001", "1234.5678", 8, 3, "0.02"),
+        ("999999", "0.99999999", 5, 8, "0"),
+    ],
+)
+def test_matches_decimal_reference(
+    amount, price, target_precision, base_precision, slippage
+):
+    """Integer fixed-point sizing agrees with pure Decimal arithmetic."""
+    args = (
+        Decimal(amount),
+        Decimal(price),
+        target_precision,
+        base_precision,
+        Decimal(slippage),
+    )
+    assert liquidity_bot.compute_swap_amounts(*args) == _decimal_reference(*args)
+
+
+def test_results_are_quantized_to_base_precision():
+    """Both outputs come back already at the base currency precision."""
+    expected_out, min_amount_out = liquidity_bot.compute_swap_amounts(
+        Decimal("50"), Decimal("0.047"), 8, 8, Decimal("0.01")
+    )
+    assert expected_out.as_tuple().exponent == -8
+    assert min_amount_out.as_tuple().exponent == -8
+    assert min_amount_out <= expected_out
@@ -0,0 +1,40 @@
+"""Shape tests for broadcast-receipt transaction id extraction."""
+
+import pytest
+
+liquidity_bot = pytest.importorskip("liquidityBot")
+
+
+@pytest.mark.parametrize(
+    ("receipt", "expected"),
+    [
+        ({"trx_id": "abc123"}, "abc123"),
+        ({"id": "def456"}, "def456"),
+        ({"result": {"id": "ghi789"}}, "ghi789"),
+    ],
+)
+def test_known_receipt_shapes(receipt, expected):
+    """Each of the three known receipt shapes yields its transaction id."""
+    assert liquidity_bot.extract_trx_id(receipt) == expected
+
+
+def test_path_precedence():
+    """A top-level trx_id wins over a nested result id."""
+    receipt = {"trx_id": "top", "id": "middle", "result": {"id": "nested"}}
+    assert liquidity_bot.extract_trx_id(receipt) == "top"
+
+
+@pytest.mark.parametrize(
+    "receipt",
+    [
+        None,
+        "not-a-dict",
+        {},
+        {"result": "not-a-dict"},
+        {"trx_id": ""},
+        {"result": {}},
+    ],
+)
+def test_unusable_receipts_return_none(receipt):
+    """Non-dict, empty, and falsy-id receipts all return None."""
+    assert liquidity_bot.extract_trx_id(receipt) is None